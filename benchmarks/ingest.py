@@ -0,0 +1,317 @@
+"""
+Offline benchmark of the MQTT ingest path.
+
+Synthetic Pulson topic streams are fed through the same components a
+config entry uses (message handling and serial routing of the shared
+connection, topic router, API client data model and update scheduler)
+without a broker. Every input
+and partition gets a counting update callback standing in for its entities.
+
+Scenarios:
+- steady: status toggles of random lines on a warmed-up model,
+- storm: the full retained tree republished after reconnects, mostly with
+  unchanged values.
+
+Messages are fed as one burst without yielding to timers, so state writes
+show the update scheduler coalescing at its best. Each scenario runs for
+every requested panel count. Reported are throughput, per-message latency
+percentiles, state writes, and from a second pass under tracemalloc the
+peak traced memory and memory blocks retained per message.
+
+Run with scripts/bench, which sets PYTHONPATH like scripts/develop.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from pulson_alarm.api import IntegrationPulsonAlarmApiClient
+from pulson_alarm.const import TOPIC_MODULE_INPUTS, TOPIC_MODULE_PARTITIONS
+from pulson_alarm.metrics import PulsonIngestMetrics
+from pulson_alarm.mqtt_client import PulsonConfig, PulsonMqttConnection
+from pulson_alarm.router import PulsonTopicRouter, parse_topic
+from pulson_alarm.scheduler import PulsonUpdateScheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+class Message(NamedTuple):
+    """Received message with the topic and payload types of the MQTT client."""
+
+    topic: str
+    payload: bytes
+
+
+class _NullMqttClient:
+    """Stand-in for PulsonMqttClient that only knows its serial number."""
+
+    def __init__(self, serial_number: str) -> None:
+        self.serial_number = serial_number
+
+
+class _Panel:
+    """Components of one config entry wired like async_setup_entry does."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        serial_number: str,
+        metrics: PulsonIngestMetrics | None,
+    ) -> None:
+        self.writes = 0
+        self.scheduler = PulsonUpdateScheduler(loop, metrics=metrics)
+        self.api = api = IntegrationPulsonAlarmApiClient(
+            mqtt_client=_NullMqttClient(serial_number),  # type: ignore[arg-type]
+            scheduler=self.scheduler,
+        )
+        self.router = router = PulsonTopicRouter(metrics)
+        router.register(
+            TOPIC_MODULE_INPUTS,
+            lambda topic, payload: api.input_update_param(
+                topic.number, topic.action, payload
+            ),
+        )
+        router.register(
+            TOPIC_MODULE_PARTITIONS,
+            lambda topic, payload: api.partition_update_param(
+                topic.number, topic.action, payload
+            ),
+        )
+        api.input_register_added_callback(
+            lambda input_id: api.input_register_update_callback(input_id, self._write)
+        )
+        api.partition_register_added_callback(
+            lambda partition_id: api.partition_register_update_callback(
+                partition_id, self._write
+            )
+        )
+
+    def _write(self) -> None:
+        """Count a state write of an entity."""
+        self.writes += 1
+
+    async def handle_message(self, topic: str, payload: bytes) -> None:
+        """Route a message like the handler registered by async_setup_entry."""
+        self.router.route(topic, payload)
+
+
+def _serials(panels: int) -> list[str]:
+    """Return serial numbers of the simulated panels."""
+    return [f"BENCH{index:04d}" for index in range(panels)]
+
+
+def retained_tree(
+    serials: Sequence[str], inputs: int, partitions: int
+) -> list[Message]:
+    """Return every retained topic of the panels, as sent after a subscribe."""
+    messages = []
+    for serial in serials:
+        for input_id in range(1, inputs + 1):
+            base = f"system/{serial}/inputs/{input_id}"
+            messages.append(Message(f"{base}/status", b"1"))
+            messages.append(Message(f"{base}/block", b"0"))
+            messages.append(Message(f"{base}/block_enable", b"1"))
+        for partition_id in range(1, partitions + 1):
+            base = f"system/{serial}/partitions/{partition_id}"
+            messages.append(Message(f"{base}/status", b"0"))
+            messages.append(Message(f"{base}/ready", b"1"))
+            messages.append(Message(f"{base}/exit_time", b"0"))
+            messages.append(Message(f"{base}/night_mode", b"1"))
+            messages.append(Message(f"{base}/active", b"1"))
+    return messages
+
+
+def steady_toggles(
+    serials: Sequence[str], inputs: int, count: int, rng: random.Random
+) -> list[Message]:
+    """Return status changes of random lines alternating closed and open."""
+    open_lines: set[tuple[str, int]] = set()
+    messages = []
+    for _ in range(count):
+        line = (rng.choice(serials), rng.randint(1, inputs))
+        if line in open_lines:
+            open_lines.remove(line)
+            payload = b"1"
+        else:
+            open_lines.add(line)
+            payload = b"2"
+        messages.append(Message(f"system/{line[0]}/inputs/{line[1]}/status", payload))
+    return messages
+
+
+def reconnect_storm(
+    serials: Sequence[str], inputs: int, partitions: int, storms: int
+) -> list[Message]:
+    """Return the retained tree repeated as after several reconnects."""
+    return retained_tree(serials, inputs, partitions) * storms
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Return a percentile of sorted values."""
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def _feed(
+    serials: Sequence[str],
+    warmup: Sequence[Message],
+    messages: Sequence[Message],
+    *,
+    metrics: bool,
+    trace: bool,
+) -> dict[str, Any]:
+    """Feed messages through fresh panels and measure the ingest path."""
+    loop = asyncio.get_running_loop()
+    parse_topic.cache_clear()
+    connection = PulsonMqttConnection(
+        PulsonConfig(host="bench", username="", password="", serial_number="")
+    )
+    panels = [
+        _Panel(loop, serial, PulsonIngestMetrics() if metrics else None)
+        for serial in serials
+    ]
+    for panel, serial in zip(panels, serials, strict=True):
+        connection._handlers[serial] = panel.handle_message  # noqa: SLF001
+    for message in warmup:
+        await connection._receive(message)  # noqa: SLF001
+    for panel in panels:
+        panel.scheduler.flush()
+        panel.writes = 0
+
+    latencies = []
+    clock = time.perf_counter
+    if trace:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        blocks_before = sum(
+            stat.count for stat in tracemalloc.take_snapshot().statistics("filename")
+        )
+    start = clock()
+    if trace:
+        # Latencies are not collected so that only the ingest path allocates
+        for message in messages:
+            await connection._receive(message)  # noqa: SLF001
+    else:
+        for message in messages:
+            begin = clock()
+            await connection._receive(message)  # noqa: SLF001
+            latencies.append(clock() - begin)
+    for panel in panels:
+        panel.scheduler.flush()
+    elapsed = clock() - start
+
+    result: dict[str, Any] = {
+        "messages": len(messages),
+        "seconds": round(elapsed, 4),
+        "msgs_per_s": round(len(messages) / elapsed) if elapsed else 0,
+        "state_writes": sum(panel.writes for panel in panels),
+    }
+    if trace:
+        blocks_after = sum(
+            stat.count for stat in tracemalloc.take_snapshot().statistics("filename")
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["alloc_peak_kib"] = round(peak / 1024, 1)
+        result["alloc_blocks_per_msg"] = round(
+            (blocks_after - blocks_before) / max(len(messages), 1), 3
+        )
+    else:
+        latencies.sort()
+        result["p50_us"] = round(_percentile(latencies, 0.5) * 1e6, 2)
+        result["p99_us"] = round(_percentile(latencies, 0.99) * 1e6, 2)
+        result["max_us"] = round(latencies[-1] * 1e6, 2) if latencies else 0.0
+    for panel in panels:
+        panel.scheduler.stop()
+    return result
+
+
+async def run_scenario(
+    scenario: str, panels: int, args: argparse.Namespace
+) -> dict[str, Any]:
+    """Run a scenario for a number of panels, timed and then traced."""
+    serials = _serials(panels)
+    if scenario == "steady":
+        warmup = retained_tree(serials, args.inputs, args.partitions)
+        messages = steady_toggles(
+            serials, args.inputs, args.messages, random.Random(args.seed)
+        )
+    else:
+        warmup = []
+        messages = reconnect_storm(serials, args.inputs, args.partitions, args.storms)
+    timed = await _feed(serials, warmup, messages, metrics=args.metrics, trace=False)
+    traced = await _feed(serials, warmup, messages, metrics=args.metrics, trace=True)
+    return {
+        "scenario": scenario,
+        "panels": panels,
+        **timed,
+        "alloc_peak_kib": traced["alloc_peak_kib"],
+        "alloc_blocks_per_msg": traced["alloc_blocks_per_msg"],
+    }
+
+
+def _print_table(results: Sequence[dict[str, Any]]) -> None:
+    """Print results as an aligned table."""
+    columns = (
+        "scenario",
+        "panels",
+        "messages",
+        "msgs_per_s",
+        "p50_us",
+        "p99_us",
+        "max_us",
+        "state_writes",
+        "alloc_peak_kib",
+        "alloc_blocks_per_msg",
+    )
+    rows = [[str(result[column]) for column in columns] for result in results]
+    widths = [
+        max(len(column), *(len(row[index]) for row in rows))
+        for index, column in enumerate(columns)
+    ]
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths, strict=True)))
+    for row in rows:
+        print("  ".join(v.rjust(w) for v, w in zip(row, widths, strict=True)))
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", choices=("steady", "storm", "all"), default="all")
+    parser.add_argument("--panels", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--storms", type=int, default=5)
+    parser.add_argument("--inputs", type=int, default=64)
+    parser.add_argument("--partitions", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--metrics", action="store_true", help="enable ingest timing hooks"
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    """Run the selected scenarios and print their results."""
+    args = _parse_args()
+    scenarios = ("steady", "storm") if args.scenario == "all" else (args.scenario,)
+    results = [
+        await run_scenario(scenario, panels, args)
+        for scenario in scenarios
+        for panels in args.panels
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,41 +8,91 @@ https://github.com/ludeeus/pulson_alarm
 from __future__ import annotations
 
 import os
-from datetime import timedelta
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if os.getenv("HA_DEBUG", "0") == "1":
     import debugpy
+from asyncio_mqtt import MqttError
 from homeassistant.components.frontend import async_register_built_in_panel
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.const import Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.loader import async_get_loaded_integration
 
 from .api import IntegrationPulsonAlarmApiClient
 from .const import (
-    CLOUD_TOPIC_ACTION_INDEX,
-    CLOUD_TOPIC_MODULE_INDEX,
-    CLOUD_TOPIC_NUMBER_INDEX,
+    CONF_CA_CERTS,
+    CONF_CLIENT_CERT,
+    CONF_CLIENT_KEY,
+    CONF_COLUMN_STORE,
+    CONF_HISTORY_FILE,
+    CONF_IDLE_TIMEOUT,
+    CONF_METRICS,
+    CONF_SERIAL_NUMBER,
+    CONF_UPDATE_MAX_LATENCY,
+    CONF_UPDATE_WINDOW,
+    DATA_CONNECTION_MANAGER,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_UPDATE_MAX_LATENCY,
+    DEFAULT_UPDATE_WINDOW,
     DOMAIN,
+    HISTORY_WRITE_INTERVAL,
     LOGGER,
+    TOPIC_MODULE_INPUTS,
+    TOPIC_MODULE_PARTITIONS,
 )
 from .coordinator import PulsonAlarmDataUpdateCoordinator
 from .data import IntegrationPulsonAlarmData
-from .mqtt_client import PulsonConfig, PulsonMqttClient
+from .device import async_migrate_device_identifiers, hub_device_info
+from .discovery import PulsonDiscoveryQueue
+from .history import PulsonEventHistory, append_events
+from .metrics import PulsonIngestMetrics
+from .mqtt_client import PulsonConfig, PulsonConnectionManager, PulsonMqttClient
+from .router import PulsonTopicRouter
+from .scheduler import PulsonUpdateScheduler
+from .services import async_setup_services
+from .snapshot import PulsonSnapshotStore, async_remove_snapshot
+from .store import InputColumnStore
+from .websocket import async_setup_websocket
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import IntegrationPulsonAlarmConfigEntry
 
 PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
     Platform.SENSOR,
     Platform.SWITCH,
     Platform.ALARM_CONTROL_PANEL,
 ]
 
+# Prefixes of entity unique ids used before they included the serial number,
+# split where the serial number is inserted
+_LEGACY_UNIQUE_IDS = (
+    ("pulson", "line_"),
+    ("pulson", "partition_"),
+    (DOMAIN, "alarm_panel_"),
+)
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    """Register services and websocket commands shared by all panels."""
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    return True
+
 
 async def register_panel(hass: HomeAssistant) -> None:
     """Register cudtom panel of integration."""
@@ -65,6 +115,53 @@ async def register_panel(hass: HomeAssistant) -> None:
     )
 
 
+def _create_message_handler(
+    router: PulsonTopicRouter, metrics: PulsonIngestMetrics | None
+) -> Callable[[str, bytes], Awaitable[None]]:
+    """Return the MQTT message handler, timed only if metrics are enabled."""
+    if metrics is None:
+
+        async def handle_message(topic: str, payload: bytes) -> None:
+            router.route(topic, payload)
+
+        return handle_message
+
+    async def handle_timed_message(topic: str, payload: bytes) -> None:
+        start = metrics.clock()
+        router.route(topic, payload)
+        metrics.message_handled(start)
+
+    return handle_timed_message
+
+
+def _history_path(hass: HomeAssistant, entry_id: str) -> Path:
+    """Return the path of the history file of a config entry."""
+    return Path(hass.config.path(f"{DOMAIN}.{entry_id}.history.jsonl"))
+
+
+def _setup_history_file(
+    hass: HomeAssistant,
+    entry: IntegrationPulsonAlarmConfigEntry,
+    history: PulsonEventHistory,
+) -> None:
+    """Append recorded changes to the history file periodically and on unload."""
+    path = _history_path(hass, entry.entry_id)
+
+    async def async_write(_now: Any = None) -> None:
+        events = history.take_unwritten()
+        if not events:
+            return
+        try:
+            await hass.async_add_executor_job(append_events, path, events)
+        except OSError as err:
+            LOGGER.error("Unable to write history to %s: %s", path, err)
+
+    entry.async_on_unload(async_write)
+    entry.async_on_unload(
+        async_track_time_interval(hass, async_write, HISTORY_WRITE_INTERVAL)
+    )
+
+
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -92,27 +189,77 @@ async def async_setup_entry(
         serial_number=serial_number,
         port=port,
         user_code=user_code,
+        ca_certs=config.get(CONF_CA_CERTS) or None,
+        certfile=config.get(CONF_CLIENT_CERT) or None,
+        keyfile=config.get(CONF_CLIENT_KEY) or None,
+    )
+    manager = hass.data.setdefault(DATA_CONNECTION_MANAGER, PulsonConnectionManager())
+    mqtt_client = PulsonMqttClient(cfg, manager)
+
+    # Timing of the ingest pipeline, skipped entirely unless enabled
+    metrics = PulsonIngestMetrics() if entry.options.get(CONF_METRICS) else None
+
+    scheduler = PulsonUpdateScheduler(
+        hass.loop,
+        window=entry.options.get(CONF_UPDATE_WINDOW, DEFAULT_UPDATE_WINDOW),
+        max_latency=entry.options.get(
+            CONF_UPDATE_MAX_LATENCY, DEFAULT_UPDATE_MAX_LATENCY
+        ),
+        metrics=metrics,
     )
-    mqtt_client = PulsonMqttClient(cfg)
+    entry.async_on_unload(scheduler.stop)
+    discovery = PulsonDiscoveryQueue(hass.loop)
+    entry.async_on_unload(discovery.stop)
+
+    history = PulsonEventHistory(spill=entry.options.get(CONF_HISTORY_FILE, False))
+    if entry.options.get(CONF_HISTORY_FILE):
+        _setup_history_file(hass, entry, history)
 
     api_client = IntegrationPulsonAlarmApiClient(
-        session=async_get_clientsession(hass),
         mqtt_client=mqtt_client,
+        scheduler=scheduler,
+        history=history,
+        input_store=(
+            InputColumnStore() if entry.options.get(CONF_COLUMN_STORE) else None
+        ),
+    )
+
+    # Restore last known state so entities exist before MQTT republishes it
+    snapshot = PulsonSnapshotStore(hass, entry, api_client)
+    await snapshot.async_restore()
+
+    # MQTT receive handler with api
+    router = PulsonTopicRouter(metrics)
+    router.register(
+        TOPIC_MODULE_INPUTS,
+        lambda topic, payload: api_client.input_update_param(
+            topic.number, topic.action, payload
+        ),
+    )
+    router.register(
+        TOPIC_MODULE_PARTITIONS,
+        lambda topic, payload: api_client.partition_update_param(
+            topic.number, topic.action, payload
+        ),
     )
 
     """Set up this integration using UI."""
     coordinator = PulsonAlarmDataUpdateCoordinator(
-        hass=hass,
-        logger=LOGGER,
-        name=DOMAIN,
-        update_interval=timedelta(hours=1),
-        api_client=api_client,
+        hass,
+        api_client,
+        router,
+        idle_timeout=entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
     )
 
     entry.runtime_data = IntegrationPulsonAlarmData(
         api_client=api_client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        scheduler=scheduler,
+        router=router,
+        snapshot=snapshot,
+        discovery=discovery,
+        metrics=metrics,
     )
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
@@ -121,61 +268,86 @@ async def async_setup_entry(
     }
 
     api_client.entity_register_update_callback(coordinator.async_update_listeners)
-
-    # MQTT receive handler with api
-    async def handle_message(topic: str, payload: str) -> None:
-        LOGGER.info("Odebrano z MQTT: %s = %s", topic, payload)
-        parts = topic.split("/")
-        if (
-            len(parts) > CLOUD_TOPIC_MODULE_INDEX
-            and parts[CLOUD_TOPIC_MODULE_INDEX] == "inputs"
-        ):
-            input_id = parts[CLOUD_TOPIC_NUMBER_INDEX]
-            key = parts[CLOUD_TOPIC_ACTION_INDEX]
-            if payload.__len__ == 0:
-                return
-            try:
-                api_client.input_update_param(input_id, key, payload)
-            except (ValueError, TypeError) as e:
-                LOGGER.warning("Problem with parsing input state: %s", e)
-        elif (
-            len(parts) > CLOUD_TOPIC_MODULE_INDEX
-            and parts[CLOUD_TOPIC_MODULE_INDEX] == "partitions"
-        ):
-            partition_id = parts[CLOUD_TOPIC_NUMBER_INDEX]
-            key = parts[CLOUD_TOPIC_ACTION_INDEX]
-            if payload.__len__ == 0:
-                return
-            try:
-                api_client.partition_update_param(partition_id, key, payload)
-            except (ValueError, TypeError) as e:
-                LOGGER.warning("Problem with parsing partition state: %s", e)
+    mqtt_client.register_connection_callback(api_client.set_connected)
 
     # Start MQTT z handlerem
-    await mqtt_client.start(handle_message)
+    try:
+        await mqtt_client.start(_create_message_handler(router, metrics))
+    except MqttError as err:
+        msg = f"Unable to connect to {host}:{port}: {err}"
+        raise ConfigEntryNotReady(msg) from err
+    snapshot.async_setup()
+
+    # Lines and partitions are linked to the panel device via via_device
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, **hub_device_info(serial_number)
+    )
+    async_migrate_device_identifiers(hass, entry.entry_id, serial_number)
 
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
     await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(coordinator.async_start_health_check())
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     # await register_panel(hass)  # noqa: ERA001
     return True
 
 
+async def async_migrate_entry(
+    hass: HomeAssistant,
+    entry: IntegrationPulsonAlarmConfigEntry,
+) -> bool:
+    """Migrate an entry and its entities to unique ids with the serial number."""
+    if entry.version > 1:
+        return False
+    if entry.minor_version < 2:  # noqa: PLR2004
+        serial_number = entry.data.get(CONF_SERIAL_NUMBER) or ""
+
+        @callback
+        def migrate_unique_id(entity: er.RegistryEntry) -> dict[str, Any] | None:
+            for head, tail in _LEGACY_UNIQUE_IDS:
+                if entity.unique_id.startswith(f"{head}_{tail}"):
+                    rest = entity.unique_id[len(head) + 1 :]
+                    return {"new_unique_id": f"{head}_{serial_number}_{rest}"}
+            return None
+
+        await er.async_migrate_entries(hass, entry.entry_id, migrate_unique_id)
+        hass.config_entries.async_update_entry(
+            entry, unique_id=serial_number, minor_version=2
+        )
+        LOGGER.info("Migrated %s to unique ids with serial number", entry.title)
+    return True
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: IntegrationPulsonAlarmConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
+    await entry.runtime_data.snapshot.async_save()
     client = hass.data[DOMAIN][entry.entry_id]["mqtt_client"]
     await client.stop()
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: IntegrationPulsonAlarmConfigEntry,
+) -> None:
+    """Remove data stored for a deleted entry."""
+    await async_remove_snapshot(hass, entry.entry_id)
+    path = _history_path(hass, entry.entry_id)
+    await hass.async_add_executor_job(path.unlink, True)  # noqa: FBT003
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: IntegrationPulsonAlarmConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """
+    Reload config entry after its options or connection settings changed.
+
+    The config entry manager runs the unload callbacks of the entry, so
+    timers, tasks and this listener of the previous setup are removed.
+    """
+    await hass.config_entries.async_reload(entry.entry_id)
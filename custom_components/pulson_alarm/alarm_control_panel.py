@@ -12,13 +12,13 @@ from homeassistant.components.alarm_control_panel.const import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from pulson_alarm.api import IntegrationPulsonAlarmApiClient
 from pulson_alarm.const import DOMAIN
 from pulson_alarm.coordinator import PulsonAlarmDataUpdateCoordinator
 
-from .partition_sensor import PartitionState, _safe_int
+from .entity import PulsonAlarmPartitionEntity, async_run_command
+from .status import resolve_partition_status
 
 
 def create_alarm_panel_adder(
@@ -29,14 +29,18 @@ def create_alarm_panel_adder(
     """Create a function that adds alarm panel entities dynamically."""
     registered_panels: dict[str, PulsonAlarmPanel] = {}
 
-    def add_alarm_panel(partition_id: str) -> None:
-        if partition_id in registered_panels:
-            return
+    def add_alarm_panel(*partition_ids: str) -> None:
+        entities = []
+        for partition_id in partition_ids:
+            if partition_id in registered_panels:
+                continue
 
-        panel_entity = PulsonAlarmPanel(coordinator, partition_id, api)
-        registered_panels[partition_id] = panel_entity
+            panel_entity = PulsonAlarmPanel(coordinator, partition_id, api)
+            registered_panels[partition_id] = panel_entity
+            entities.append(panel_entity)
 
-        async_add_entities([panel_entity])
+        if entities:
+            async_add_entities(entities)
 
     return add_alarm_panel
 
@@ -52,13 +56,13 @@ async def async_setup_entry(
     api: IntegrationPulsonAlarmApiClient = coordinator.api_client
 
     add_alarm_panel = create_alarm_panel_adder(coordinator, api, async_add_entities)
-    api.partition_register_added_callback(add_alarm_panel)
+    discovery = entry.runtime_data.discovery
+    api.partition_register_added_callback(discovery.wrap(add_alarm_panel))
 
-    for partition_id in api.partition_get_all_ids():
-        add_alarm_panel(partition_id)
+    add_alarm_panel(*api.partition_get_all_ids())
 
 
-class PulsonAlarmPanel(AlarmControlPanelEntity, CoordinatorEntity):
+class PulsonAlarmPanel(PulsonAlarmPartitionEntity, AlarmControlPanelEntity):
     """Representation of an Alarm Panel (partition) entity."""
 
     def __init__(
@@ -68,10 +72,10 @@ class PulsonAlarmPanel(AlarmControlPanelEntity, CoordinatorEntity):
         api: IntegrationPulsonAlarmApiClient,
     ) -> None:
         """Initialize the panel entity."""
-        super().__init__(coordinator)
-        self._partition_id = partition_id
-        self._api = api
-        self._attr_unique_id = f"{DOMAIN}_alarm_panel_{partition_id}"
+        super().__init__(coordinator, partition_id, api)
+        self._attr_unique_id = (
+            f"{DOMAIN}_{api.serial_number}_alarm_panel_{partition_id}"
+        )
         self._attr_name = f"Partycja {partition_id}"
         self._attr_code_format = "number"  # type: ignore  # noqa: PGH003
 
@@ -80,62 +84,39 @@ class PulsonAlarmPanel(AlarmControlPanelEntity, CoordinatorEntity):
             | AlarmControlPanelEntityFeature.ARM_AWAY
             | AlarmControlPanelEntityFeature.ARM_NIGHT
         )
-
-    @property
-    def state(self) -> str:
-        """Return the current state."""
-        data = self._api.partition_get_state(self._partition_id)
-        status = _safe_int(data.get("status"))
-
-        match status:
-            case PartitionState.DISARMED:
-                return AlarmControlPanelState.DISARMED
-            case PartitionState.ARMED:
-                return AlarmControlPanelState.ARMED_AWAY
-            case PartitionState.ARMED_NIGHT:
-                return AlarmControlPanelState.ARMED_NIGHT
-            case PartitionState.ENTRY_TIME | PartitionState.ENTRY_TIME_NIGHT:
-                return AlarmControlPanelState.PENDING
-            case PartitionState.EXIT_TIME | PartitionState.EXIT_TIME_NIGHT:
-                return AlarmControlPanelState.ARMING
-            case _:
-                return AlarmControlPanelState.PENDING
+        self._update_attrs()
+
+    def _update_attrs(self) -> None:
+        """Resolve the alarm state of the partition once per change."""
+        pending = self._api.partition_get_pending(self._partition_id)
+        if pending is not None:
+            self._attr_alarm_state = (
+                AlarmControlPanelState.DISARMING
+                if pending.action == "disarm"
+                else AlarmControlPanelState.ARMING
+            )
+            return
+        status = self._api.partition_get_state(self._partition_id).status
+        self._attr_alarm_state = resolve_partition_status(status).alarm_state
 
     async def async_alarm_disarm(self, code: str | None = None) -> None:
         """Send disarm command."""
-        await self._api.partition_disarm(self._partition_id, code)
-        self.async_write_ha_state()
+        await async_run_command(self._api.partition_disarm(self._partition_id, code))
 
     async def async_alarm_arm_away(self, code: str | None = None) -> None:
         """Send arm command."""
-        await self._api.partition_arm(self._partition_id, code)
-        self.async_write_ha_state()
+        await async_run_command(self._api.partition_arm(self._partition_id, code))
 
     async def async_alarm_arm_home(self, code: str | None = None) -> None:
         """Send 'home' (stay) arm command. Can be same as 'away'."""
-        await self._api.partition_arm(self._partition_id, code)
-        self.async_write_ha_state()
+        await async_run_command(self._api.partition_arm(self._partition_id, code))
 
     async def async_alarm_arm_night(self, code: str | None = None) -> None:
         """Send night arm command."""
-        await self._api.partition_arm_night(self._partition_id, code)
-        self.async_write_ha_state()
+        await async_run_command(self._api.partition_arm_night(self._partition_id, code))
 
     @property
     def available(self) -> bool:
         """Return True if partition is ready and active."""
-        data = self._api.partition_get_state(self._partition_id)
-        return bool(_safe_int(data.get("ready"))) and str(
-            data.get("active", "")
-        ).lower().startswith("true")
-
-    @property
-    def device_info(self) -> dict:
-        """Device info to group entities under one device."""
-        return {
-            "identifiers": {(DOMAIN, f"partition_alarm_panel_{self._partition_id}")},
-            "name": f"Partycja {self._partition_id} - Panel alarmowy",
-            "manufacturer": "Pulson Alarm",
-            "model": "Alarm Panel",
-            "entry_type": "service",
-        }
+        state = self._api.partition_get_state(self._partition_id)
+        return super().available and state.ready and state.active
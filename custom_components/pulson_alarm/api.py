@@ -1,18 +1,36 @@
-"""Sample API Client."""
+"""API client keeping the model of a panel fed by MQTT and sending commands."""
 
 from __future__ import annotations
 
-import socket
+import asyncio
+import time
 from typing import TYPE_CHECKING, Any
 
-import aiohttp
-import async_timeout
+from asyncio_mqtt import MqttError
+
+from .commands import PulsonCommand, PulsonCommandDispatcher
+from .const import (
+    COMMAND_INFLIGHT_WINDOW,
+    COMMAND_QOS,
+    DEFAULT_COMMAND_TIMEOUT,
+    EXIT_TIME_MAX_DRIFT,
+    LOGGER,
+    TOPIC_MODULE_INPUTS,
+    TOPIC_MODULE_PARTITIONS,
+)
+from .history import PulsonEventHistory
+from .model import InputState, PartitionState, PartitionStatus
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Awaitable, Callable, Hashable, Mapping
 
     from pulson_alarm.mqtt_client import PulsonMqttClient
 
+    from .scheduler import PulsonUpdateScheduler
+    from .store import InputColumnRecord, InputColumnStore
+
+    type InputRecord = InputState | InputColumnRecord
+
 
 class IntegrationPulsonAlarmApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -30,42 +48,120 @@ class IntegrationPulsonAlarmApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
-def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
-    """Verify that the response is valid."""
-    if response.status in (401, 403):
-        msg = "Invalid credentials"
-        raise IntegrationPulsonAlarmApiClientAuthenticationError(
-            msg,
-        )
-    response.raise_for_status()
+class IntegrationPulsonAlarmApiClientCommandError(
+    IntegrationPulsonAlarmApiClientError,
+):
+    """Exception to indicate that the panel did not confirm a command."""
+
+
+_ARM_STATES = frozenset({PartitionStatus.ARMED, PartitionStatus.EXIT_TIME})
+_ARM_NIGHT_STATES = frozenset(
+    {PartitionStatus.ARMED_NIGHT, PartitionStatus.EXIT_TIME_NIGHT}
+)
+_DISARM_STATES = frozenset({PartitionStatus.DISARMED})
+_EXIT_STATES = frozenset({PartitionStatus.EXIT_TIME, PartitionStatus.EXIT_TIME_NIGHT})
 
 
 class IntegrationPulsonAlarmApiClient:
-    """Sample API Client."""
+    """Model of inputs and partitions of a panel, and commands sent to it."""
 
     def __init__(
         self,
-        session: aiohttp.ClientSession,
         mqtt_client: PulsonMqttClient,
+        scheduler: PulsonUpdateScheduler | None = None,
+        command_timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        history: PulsonEventHistory | None = None,
+        input_store: InputColumnStore | None = None,
     ) -> None:
-        """Sample API Client."""
-        self._session = session
+        """Initialize an empty model bound to the MQTT client of the panel."""
         self._mqtt_client = mqtt_client
-        self._inputs: dict[str, dict] = {}
-        self._partitions: dict[str, dict] = {}
+        self.history = PulsonEventHistory() if history is None else history
+        self.commands = PulsonCommandDispatcher(
+            command_timeout, on_change=self._command_changed
+        )
+        self._inflight = asyncio.Semaphore(COMMAND_INFLIGHT_WINDOW)
+        self._scheduler = scheduler
+        self._connected = False
+        self.version = 0
+        # Input records, or their views in the column store if one is used
+        self._input_store = input_store
+        self._inputs: Mapping[str, InputRecord] = (
+            {} if input_store is None else input_store
+        )
+        self._partitions: dict[str, PartitionState] = {}
+        self._exit_deadlines: dict[str, float] = {}
+        self.exit_ticks_skipped = 0
         self._entity_update_callbacks: list[Callable[[], None]] = []
+        self._input_update_callbacks: dict[str, list[Callable[[], None]]] = {}
+        self._partition_update_callbacks: dict[str, list[Callable[[], None]]] = {}
         self._input_added_callbacks: list[Callable[[str], None]] = []
         self._partition_added_callbacks: list[Callable[[str], None]] = []
 
     def entity_register_update_callback(self, callback: Callable[[], None]) -> None:
         """
-        Register a callback to be called when input data is updated.
+        Register a callback to be called when all entities should refresh.
 
-        The callback is typically used to notify Home Assistant that
-        new data is available and entities should update their state.
+        Per-object changes are delivered through the input/partition update
+        callbacks; this one is reserved for events affecting every entity.
         """
         self._entity_update_callbacks.append(callback)
 
+    @property
+    def serial_number(self) -> str:
+        """Return serial number of the panel."""
+        return self._mqtt_client.serial_number
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the connection to the panel is up."""
+        return self._connected
+
+    def set_connected(self, connected: bool) -> None:  # noqa: FBT001
+        """
+        Store state of the connection to the panel.
+
+        All entities are refreshed so they become (un)available together.
+        """
+        if connected == self._connected:
+            return
+        self._connected = connected
+        for cb in self._entity_update_callbacks:
+            cb()
+
+    async def probe(self) -> None:
+        """
+        Make the broker resend the retained state of the panel.
+
+        Raises IntegrationPulsonAlarmApiClientCommunicationError if the
+        request cannot be sent.
+        """
+        try:
+            await self._mqtt_client.probe()
+        except MqttError as err:
+            msg = f"Unable to probe panel {self.serial_number}: {err}"
+            raise IntegrationPulsonAlarmApiClientCommunicationError(msg) from err
+
+    def reconnect(self, reason: str) -> None:
+        """Reconnect the MQTT session of the panel."""
+        self._mqtt_client.reconnect(reason)
+
+    def input_register_update_callback(
+        self, input_id: str, callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """
+        Register a callback to be called when the given input changes.
+
+        The callback is invoked only when a parameter of this input gets a new
+        value. Returns a function that removes the registration.
+        """
+        callbacks = self._input_update_callbacks.setdefault(input_id, [])
+        callbacks.append(callback)
+
+        def _remove() -> None:
+            callbacks.remove(callback)
+
+        return _remove
+
     def input_register_added_callback(self, callback: Callable[[str], None]) -> None:
         """
         Register a callback to be called when a new input (e.g., alarm line) is added.
@@ -80,43 +176,150 @@ class IntegrationPulsonAlarmApiClient:
         """
         Update a parameter for a specific input.
 
-        If the input ID is not known, registered 'input added' callbacks are invoked.
-        Then the value for the specified key is updated (or added).
-        Finally, all registered 'input update' callbacks are called to notify the system
-        (e.g., trigger entity updates in Home Assistant).
+        If the input ID is not known, it is added, or ValueError is raised if
+        the column store is full, and registered 'input added' callbacks are
+        invoked. Then the value for the specified key is parsed into the input record;
+        invalid payloads raise ValueError or TypeError.
+        Finally, if the value changed, callbacks registered for this input are
+        called (or scheduled) to notify the entities bound to it.
         """
-        if input_id not in self._inputs:
+        if self._scheduler is not None:
+            self._scheduler.message_received()
+        state = self._inputs.get(input_id)
+        if state is None:
+            state = self._add_input(input_id)
             for cb in self._input_added_callbacks:
                 cb(input_id)
-        if input_id not in self._inputs:
-            self._inputs[input_id] = {}
-        self._inputs[input_id][key] = value
-        for cb in self._entity_update_callbacks:
-            cb()
+        old = getattr(state, key, None)
+        changed = state.apply(key, value)
+        self.commands.state_received(TOPIC_MODULE_INPUTS, input_id, key, state)
+        if not changed:
+            return
+        self.version += 1
+        self._record(TOPIC_MODULE_INPUTS, input_id, key, old, state)
+        self._notify(
+            (TOPIC_MODULE_INPUTS, input_id), self._input_update_callbacks.get(input_id)
+        )
+
+    def _record(
+        self, module: str, object_id: str, key: str, old: Any, record: Any
+    ) -> None:
+        """Add a changed value to the history, unless only its staleness changed."""
+        new = getattr(record, key)
+        if new != old:
+            self.history.record(module, object_id, key, old, new)
 
-    def input_get_state(self, input_id: str) -> dict:
-        """Get the current state (parameter dictionary) of a specific input."""
-        return self._inputs.get(input_id, {})
+    def _notify(
+        self,
+        key: Hashable,
+        callbacks: list[Callable[[], None]] | None,
+        *,
+        urgent: bool = False,
+    ) -> None:
+        """Call update callbacks of an object, through the scheduler if set."""
+        if not callbacks:
+            return
+        if self._scheduler is None:
+            for cb in callbacks:
+                cb()
+            return
+        self._scheduler.mark_dirty(key, callbacks, urgent=urgent)
+
+    def _command_changed(self, command: PulsonCommand) -> None:
+        """Refresh entities of an object whose command became pending or ended."""
+        if command.module == TOPIC_MODULE_INPUTS:
+            callbacks = self._input_update_callbacks.get(command.object_id)
+        else:
+            callbacks = self._partition_update_callbacks.get(command.object_id)
+        self._notify((command.module, command.object_id), callbacks, urgent=True)
+
+    async def _execute(
+        self, command: PulsonCommand, topic: str, payload: str, code: str | None
+    ) -> None:
+        """
+        Publish a command and wait until the panel confirms it.
+
+        A command whose object already is in the requested state succeeds
+        without being published.
+
+        Raises IntegrationPulsonAlarmApiClientCommunicationError if the
+        command could not be published, and
+        IntegrationPulsonAlarmApiClientCommandError if the panel does not
+        publish the expected state within the timeout.
+        """
+
+        async def send() -> None:
+            async with self._inflight:
+                try:
+                    await self._mqtt_client.publish_with_code(
+                        topic, payload, retain=False, qos=COMMAND_QOS, code=code
+                    )
+                except MqttError as err:
+                    msg = (
+                        f"Failed to send {command.action} of {command.module} "
+                        f"{command.object_id} to panel {self.serial_number}: {err}"
+                    )
+                    raise IntegrationPulsonAlarmApiClientCommunicationError(
+                        msg
+                    ) from err
+
+        records = (
+            self._inputs if command.module == TOPIC_MODULE_INPUTS else self._partitions
+        )
+        confirmed = await self.commands.execute(
+            command, send, records.get(command.object_id)
+        )
+        if not confirmed:
+            msg = (
+                f"Panel {self.serial_number} did not confirm {command.action} "
+                f"of {command.module} {command.object_id}"
+            )
+            raise IntegrationPulsonAlarmApiClientCommandError(msg)
+
+    def _add_input(self, input_id: str, values: list[int] | None = None) -> InputRecord:
+        """
+        Create the record of a new input, stale if restored from values.
+
+        Raises ValueError if the column store is full.
+        """
+        if self._input_store is not None:
+            return self._input_store.add(input_id, values)
+        state = InputState() if values is None else InputState.from_list(values)
+        self._inputs[input_id] = state  # type: ignore[index]
+        return state
+
+    def input_get_state(self, input_id: str) -> InputRecord:
+        """Get the current state record of a specific input."""
+        state = self._inputs.get(input_id)
+        return InputState() if state is None else state
 
     def input_get_all_ids(self) -> list:
         """Get a list of all registered input IDs."""
         return list(self._inputs)
 
     @property
-    def inputs(self) -> dict[str, dict]:
-        """Return the full internal dictionary of all inputs and their parameters."""
+    def inputs(self) -> Mapping[str, InputRecord]:
+        """Return the full internal dictionary of all inputs and their states."""
         return self._inputs
 
     async def set_input_block_state(
         self, input_id: str, *, block: bool, code: str | None = None
     ) -> None:
-        """Change blockade state in API and send to MQTT."""
-        topic = f"inputs/{input_id}/block_set"
-        payload = "1" if block else "0"
-        await self._mqtt_client.publish_with_code(
-            topic, payload, retain=False, code=code
+        """Change blockade state of a line and wait for the panel to confirm."""
+        command = PulsonCommand(
+            TOPIC_MODULE_INPUTS,
+            input_id,
+            "block" if block else "unblock",
+            "block",
+            frozenset({block}),
+            optimistic=block,
         )
-        self.input_update_param(input_id, "block", int(block))
+        payload = "1" if block else "0"
+        await self._execute(command, f"inputs/{input_id}/block_set", payload, code)
+
+    def input_get_pending(self, input_id: str) -> PulsonCommand | None:
+        """Get the command of an input waiting for confirmation, if any."""
+        return self.commands.pending(TOPIC_MODULE_INPUTS, input_id)
 
     def partition_register_added_callback(
         self, callback: Callable[[str], None]
@@ -130,111 +333,186 @@ class IntegrationPulsonAlarmApiClient:
         """
         self._partition_added_callbacks.append(callback)
 
+    def partition_register_update_callback(
+        self, partition_id: str, callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """
+        Register a callback to be called when the given partition changes.
+
+        The callback is invoked only when a parameter of this partition gets a
+        new value. Returns a function that removes the registration.
+        """
+        callbacks = self._partition_update_callbacks.setdefault(partition_id, [])
+        callbacks.append(callback)
+
+        def _remove() -> None:
+            callbacks.remove(callback)
+
+        return _remove
+
     def partition_update_param(self, partition_id: str, key: str, value: Any) -> None:
         """
         Update a parameter for a specific partition.
 
         If the ID is not known, registered callbacks are invoked.
-        Then the value for the specified key is updated (or added).
-        Finally, all registered 'update' callbacks are called to notify the system
+        Then the value for the specified key is parsed into the partition record;
+        invalid payloads raise ValueError or TypeError.
+        Finally, if the value changed, callbacks registered for this partition
+        are called (or scheduled) to notify the entities bound to it.
+        Status changes are flushed without waiting for the coalescing window.
+        Exit time ticks agreeing with the local deadline are dropped early.
         """
+        if self._scheduler is not None:
+            self._scheduler.message_received()
         if partition_id not in self._partitions:
             for cb in self._partition_added_callbacks:
                 cb(partition_id)
-        if partition_id not in self._partitions:
-            self._partitions[partition_id] = {}
-        self._partitions[partition_id][key] = value
-        for cb in self._entity_update_callbacks:
-            cb()
+        state = self._partitions.get(partition_id)
+        if state is None:
+            state = self._partitions[partition_id] = PartitionState()
+        deadline_changed = False
+        if key == "exit_time":
+            deadline_changed = self._exit_time_received(partition_id, value)
+            if deadline_changed is None:
+                return
+        old = getattr(state, key, None)
+        changed = state.apply(key, value)
+        self.commands.state_received(TOPIC_MODULE_PARTITIONS, partition_id, key, state)
+        if key == "status" and state.status not in _EXIT_STATES:
+            deadline_changed = self._exit_deadlines.pop(partition_id, None) is not None
+        if not changed and not deadline_changed:
+            return
+        self.version += 1
+        self._record(TOPIC_MODULE_PARTITIONS, partition_id, key, old, state)
+        self._notify(
+            (TOPIC_MODULE_PARTITIONS, partition_id),
+            self._partition_update_callbacks.get(partition_id),
+            urgent=key == "status",
+        )
 
-    def partition_get_state(self, partition_id: str) -> dict:
-        """Get the current state (parameter dictionary) of a specific partition."""
-        return self._partitions.get(partition_id, {})
+    def _exit_time_received(self, partition_id: str, value: Any) -> bool | None:
+        """
+        Update the local exit deadline of a partition from its exit time.
+
+        The panel republishes the remaining seconds on every tick. Only the
+        first value sets the deadline; later ticks within the drift limit
+        are redundant and return None, so they are not processed at all.
+        Otherwise returns whether the deadline changed.
+        """
+        remaining = int(value)
+        if remaining <= 0:
+            return self._exit_deadlines.pop(partition_id, None) is not None
+        deadline = time.time() + remaining
+        current = self._exit_deadlines.get(partition_id)
+        if current is not None and abs(current - deadline) <= EXIT_TIME_MAX_DRIFT:
+            self.exit_ticks_skipped += 1
+            return None
+        self._exit_deadlines[partition_id] = deadline
+        return True
+
+    def partition_get_exit_deadline(self, partition_id: str) -> float | None:
+        """Get the POSIX time at which the exit time of an arming partition ends."""
+        state = self._partitions.get(partition_id)
+        if state is None or state.status not in _EXIT_STATES:
+            return None
+        return self._exit_deadlines.get(partition_id)
+
+    def partition_get_state(self, partition_id: str) -> PartitionState:
+        """Get the current state record of a specific partition."""
+        state = self._partitions.get(partition_id)
+        return PartitionState() if state is None else state
 
     def partition_get_all_ids(self) -> list:
         """Get a list of all registered partition IDs."""
         return list(self._partitions)
 
     @property
-    def partitions(self) -> dict[str, dict]:
-        """Return the full dictionary of all partitions and their parameters."""
+    def partitions(self) -> dict[str, PartitionState]:
+        """Return the full dictionary of all partitions and their states."""
         return self._partitions
 
+    def snapshot(self) -> dict[str, Any]:
+        """Return inputs and partitions in compact form for persistence."""
+        return {
+            "inputs": (
+                {input_id: state.to_list() for input_id, state in self._inputs.items()}
+                if self._input_store is None
+                else self._input_store.to_lists()
+            ),
+            "partitions": {
+                partition_id: state.to_list()
+                for partition_id, state in self._partitions.items()
+            },
+        }
+
+    def restore(self, snapshot: dict[str, Any]) -> None:
+        """
+        Load inputs and partitions saved by snapshot().
+
+        Restored records are marked stale until a live value arrives. Objects
+        already known are left untouched and no callbacks are invoked.
+        """
+        for input_id, values in snapshot.get("inputs", {}).items():
+            if input_id not in self._inputs:
+                try:
+                    self._add_input(input_id, values)
+                except ValueError as err:
+                    LOGGER.warning("Input %s not restored: %s", input_id, err)
+        for partition_id, values in snapshot.get("partitions", {}).items():
+            if partition_id not in self._partitions:
+                self._partitions[partition_id] = PartitionState.from_list(values)
+
     async def partition_arm(self, partition_id: str, code: str | None = None) -> None:
-        """Arm partition, send to MQTT."""
-        topic = f"partitions/{partition_id}/set_arm"
-        payload = "1"
-        await self._mqtt_client.publish_with_code(
-            topic, payload, retain=False, code=code
+        """Arm partition and wait until it is armed or its exit time runs."""
+        command = PulsonCommand(
+            TOPIC_MODULE_PARTITIONS, partition_id, "arm", "status", _ARM_STATES
         )
+        await self._execute(command, f"partitions/{partition_id}/set_arm", "1", code)
 
     async def partition_disarm(
         self, partition_id: str, code: str | None = None
     ) -> None:
-        """Disarm partition, send to MQTT."""
-        topic = f"partitions/{partition_id}/set_disarm"
-        payload = "0"
-        await self._mqtt_client.publish_with_code(
-            topic, payload, retain=False, code=code
+        """Disarm partition and wait until it is disarmed."""
+        command = PulsonCommand(
+            TOPIC_MODULE_PARTITIONS, partition_id, "disarm", "status", _DISARM_STATES
         )
+        await self._execute(command, f"partitions/{partition_id}/set_disarm", "0", code)
 
     async def partition_arm_night(
         self, partition_id: str, code: str | None = None
     ) -> None:
-        """Night arm partition, send to MQTT."""
-        topic = f"partitions/{partition_id}/set_arm"
-        payload = "2"
-        await self._mqtt_client.publish_with_code(
-            topic, payload, retain=False, code=code
+        """Night arm partition and wait until it is armed or its exit time runs."""
+        command = PulsonCommand(
+            TOPIC_MODULE_PARTITIONS,
+            partition_id,
+            "arm_night",
+            "status",
+            _ARM_NIGHT_STATES,
         )
+        await self._execute(command, f"partitions/{partition_id}/set_arm", "2", code)
 
-    async def async_get_data(self) -> Any:
-        """Get data from the API."""
-        return await self._api_wrapper(
-            method="get",
-            url="https://jsonplaceholder.typicode.com/posts/1",
-        )
-
-    async def async_set_title(self, value: str) -> Any:
-        """Get data from the API."""
-        return await self._api_wrapper(
-            method="patch",
-            url="https://jsonplaceholder.typicode.com/posts/1",
-            data={"title": value},
-            headers={"Content-type": "application/json; charset=UTF-8"},
-        )
+    @staticmethod
+    async def execute_many(
+        commands: dict[str, Awaitable[None]],
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Run commands of several objects concurrently and collect their results.
 
-    async def _api_wrapper(
-        self,
-        method: str,
-        url: str,
-        data: dict | None = None,
-        headers: dict | None = None,
-    ) -> Any:
-        """Get information from the API."""
-        try:
-            async with async_timeout.timeout(10):
-                response = await self._session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=data,
-                )
-                _verify_response_or_raise(response)
-                return await response.json()
-
-        except TimeoutError as exception:
-            msg = f"Timeout error fetching information - {exception}"
-            raise IntegrationPulsonAlarmApiClientCommunicationError(
-                msg,
-            ) from exception
-        except (aiohttp.ClientError, socket.gaierror) as exception:
-            msg = f"Error fetching information - {exception}"
-            raise IntegrationPulsonAlarmApiClientCommunicationError(
-                msg,
-            ) from exception
-        except Exception as exception:  # pylint: disable=broad-except
-            msg = f"Something really wrong happened! - {exception}"
-            raise IntegrationPulsonAlarmApiClientError(
-                msg,
-            ) from exception
+        Publishes are pipelined up to the inflight window and confirmations
+        are awaited together, so the whole batch takes about one round trip.
+        Returns per object id whether the command succeeded, with the error.
+        """
+        outcomes = await asyncio.gather(*commands.values(), return_exceptions=True)
+        results: dict[str, dict[str, Any]] = {}
+        for object_id, outcome in zip(commands, outcomes, strict=True):
+            if isinstance(outcome, IntegrationPulsonAlarmApiClientError):
+                results[object_id] = {"success": False, "error": str(outcome)}
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results[object_id] = {"success": True}
+        return results
+
+    def partition_get_pending(self, partition_id: str) -> PulsonCommand | None:
+        """Get the command of a partition waiting for confirmation, if any."""
+        return self.commands.pending(TOPIC_MODULE_PARTITIONS, partition_id)
@@ -0,0 +1,55 @@
+"""Main handler of binary sensor entities responsible for adding them."""
+
+from collections.abc import Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .api import IntegrationPulsonAlarmApiClient
+from .const import DOMAIN
+from .coordinator import PulsonAlarmDataUpdateCoordinator
+from .partition_sensor import AlarmPartitionReadySensor
+
+
+def create_partition_binary_sensor_adder(
+    coordinator: PulsonAlarmDataUpdateCoordinator,
+    api: IntegrationPulsonAlarmApiClient,
+    async_add_entities: AddEntitiesCallback,
+) -> Callable[[str], None]:
+    """Create a function that adds binary sensors of new partitions."""
+    registered: dict[str, AlarmPartitionReadySensor] = {}
+
+    def add_partition_binary_sensor(*partition_ids: str) -> None:
+        entities = []
+        for partition_id in partition_ids:
+            if partition_id in registered:
+                continue
+
+            ready_entity = AlarmPartitionReadySensor(coordinator, partition_id, api)
+            registered[partition_id] = ready_entity
+            entities.append(ready_entity)
+
+        if entities:
+            async_add_entities(entities)
+
+    return add_partition_binary_sensor
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up binary sensor platform."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: PulsonAlarmDataUpdateCoordinator = data["coordinator"]
+    api: IntegrationPulsonAlarmApiClient = coordinator.api_client
+
+    add_partition_binary_sensor = create_partition_binary_sensor_adder(
+        coordinator, api, async_add_entities
+    )
+    discovery = entry.runtime_data.discovery
+    api.partition_register_added_callback(discovery.wrap(add_partition_binary_sensor))
+
+    add_partition_binary_sensor(*api.partition_get_all_ids())
@@ -0,0 +1,171 @@
+"""Tracking of commands sent to a panel until it confirms them."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .const import DEFAULT_COMMAND_TIMEOUT, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+@dataclass(slots=True)
+class PulsonCommand:
+    """
+    A command awaiting confirmation through a state topic of its object.
+
+    The command is confirmed when ``key`` of the object (e.g. the status of
+    partition 1) is published with one of the ``expected`` values. While it
+    is pending, entities may show ``optimistic`` instead of the last state.
+    """
+
+    module: str
+    object_id: str
+    action: str
+    key: str
+    expected: frozenset[Any]
+    optimistic: Any = None
+    correlation_id: int = 0
+    future: asyncio.Future[bool] | None = field(default=None, repr=False)
+
+
+class PulsonCommandDispatcher:
+    """
+    Send commands and wait for the state topics confirming them.
+
+    The Pulson protocol carries no request ids, so a command is correlated
+    with the next matching state of its object. Only the latest command of
+    an object is tracked; an older one still pending is superseded.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_COMMAND_TIMEOUT,
+        on_change: Callable[[PulsonCommand], None] | None = None,
+    ) -> None:
+        """Set the confirmation timeout and a callback of pending changes."""
+        self._timeout = timeout
+        self._on_change = on_change
+        self._pending: dict[tuple[str, str], PulsonCommand] = {}
+        self._ids = itertools.count(1)
+        self.sent = 0
+        self.confirmed = 0
+        self.timed_out = 0
+        self.superseded = 0
+        self.already = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return counters of the dispatcher."""
+        return {
+            "timeout": self._timeout,
+            "sent": self.sent,
+            "confirmed": self.confirmed,
+            "timed_out": self.timed_out,
+            "superseded": self.superseded,
+            "already": self.already,
+            "pending": len(self._pending),
+        }
+
+    def pending(self, module: str, object_id: str) -> PulsonCommand | None:
+        """Return the command of an object waiting for confirmation, if any."""
+        return self._pending.get((module, object_id))
+
+    def state_received(
+        self, module: str, object_id: str, key: str, record: Any
+    ) -> None:
+        """Confirm the pending command of an object if the state matches it."""
+        if not self._pending:
+            return
+        command = self._pending.get((module, object_id))
+        if (
+            command is None
+            or command.key != key
+            or getattr(record, key) not in command.expected
+        ):
+            return
+        del self._pending[module, object_id]
+        self.confirmed += 1
+        if command.future is not None and not command.future.done():
+            command.future.set_result(True)
+        self._changed(command)
+
+    async def execute(
+        self,
+        command: PulsonCommand,
+        send: Callable[[], Awaitable[None]],
+        record: Any = None,
+    ) -> bool:
+        """
+        Send a command and wait until the panel confirms it.
+
+        If the live record of the object already has an expected value and
+        no other command of the object is pending, the panel may publish
+        nothing, so the command succeeds at once without being sent.
+        Returns False if no confirmation arrived within the timeout or the
+        command was superseded by a newer one for the same object.
+        """
+        command.correlation_id = next(self._ids)
+        key = (command.module, command.object_id)
+        previous = self._pending.get(key)
+        if (
+            previous is None
+            and record is not None
+            and not record.stale
+            and getattr(record, command.key) in command.expected
+        ):
+            self.already += 1
+            LOGGER.debug(
+                "Command #%s: %s %s %s already in effect",
+                command.correlation_id,
+                command.action,
+                command.module,
+                command.object_id,
+            )
+            return True
+        command.future = asyncio.get_running_loop().create_future()
+        if (
+            previous is not None
+            and previous.future is not None
+            and not previous.future.done()
+        ):
+            self.superseded += 1
+            previous.future.set_result(False)
+        self._pending[key] = command
+        self.sent += 1
+        self._changed(command)
+        LOGGER.debug(
+            "Command #%s: %s %s %s",
+            command.correlation_id,
+            command.action,
+            command.module,
+            command.object_id,
+        )
+        try:
+            async with asyncio.timeout(self._timeout):
+                await send()
+                return await command.future
+        except TimeoutError:
+            self.timed_out += 1
+            LOGGER.warning(
+                "Command #%s (%s %s %s) not confirmed within %s s",
+                command.correlation_id,
+                command.action,
+                command.module,
+                command.object_id,
+                self._timeout,
+            )
+            return False
+        finally:
+            if self._pending.get(key) is command:
+                del self._pending[key]
+                self._changed(command)
+
+    def _changed(self, command: PulsonCommand) -> None:
+        """Report that a command became pending or finished."""
+        if self._on_change is not None:
+            self._on_change(command)
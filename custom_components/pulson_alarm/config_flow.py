@@ -4,37 +4,174 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
-from asyncio_mqtt import MqttError
+from asyncio_mqtt import MqttCodeError, MqttError
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
-from slugify import slugify
 
 from pulson_alarm.mqtt_client import PulsonConfig, PulsonMqttClient
 
 from .api import (
-    IntegrationPulsonAlarmApiClient,
     IntegrationPulsonAlarmApiClientAuthenticationError,
     IntegrationPulsonAlarmApiClientCommunicationError,
     IntegrationPulsonAlarmApiClientError,
 )
 from .const import (
+    CONF_CA_CERTS,
+    CONF_CLIENT_CERT,
+    CONF_CLIENT_KEY,
     CONF_CLOUD_HOST,
     CONF_CLOUD_PASSWORD,
     CONF_CLOUD_PORT,
     CONF_CLOUD_USER,
+    CONF_COLUMN_STORE,
+    CONF_HISTORY_FILE,
+    CONF_IDLE_TIMEOUT,
+    CONF_METRICS,
     CONF_SERIAL_NUMBER,
+    CONF_UPDATE_MAX_LATENCY,
+    CONF_UPDATE_WINDOW,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_UPDATE_MAX_LATENCY,
+    DEFAULT_UPDATE_WINDOW,
     DOMAIN,
     LOGGER,
+    MQTT_AUTH_ERROR_CODES,
 )
 
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+DEFAULTS_FILE = Path(__file__).parent / "default_log.json"
+
+# Path -> (mtime, values) of defaults files read so far
+_DEFAULTS_CACHE: dict[Path, tuple[float, dict[str, Any]]] = {}
+
+
+def _load_defaults(path: Path) -> dict[str, Any]:
+    """
+    Return default form values from a JSON file.
+
+    The file is parsed again only when its modification time changed. Does
+    blocking I/O, so it must run in the executor.
+    """
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        _DEFAULTS_CACHE.pop(path, None)
+        return {}
+    except OSError as e:
+        LOGGER.error("I/O error reading %s: %s", path.name, e)
+        return {}
+    cached = _DEFAULTS_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    values: Any = {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            values = json.load(f)
+    except json.JSONDecodeError as e:
+        LOGGER.error("JSON decode error in %s: %s", path.name, e)
+    except OSError as e:
+        LOGGER.error("I/O error reading %s: %s", path.name, e)
+    if not isinstance(values, dict):
+        values = {}
+    _DEFAULTS_CACHE[path] = (mtime, values)
+    return values
+
+
+async def async_get_defaults(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the default form values without blocking the event loop."""
+    return await hass.async_add_executor_job(_load_defaults, DEFAULTS_FILE)
+
+
+def _text(
+    type_: selector.TextSelectorType = selector.TextSelectorType.TEXT,
+) -> selector.TextSelector:
+    """Return a text selector of the given type."""
+    return selector.TextSelector(selector.TextSelectorConfig(type=type_))
+
+
+def _seconds(minimum: float, maximum: float, step: float) -> selector.NumberSelector:
+    """Return a number selector of a duration in seconds."""
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=minimum,
+            max=maximum,
+            step=step,
+            unit_of_measurement="s",
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    )
+
+
+def _connection_schema(defaults: dict[str, Any]) -> vol.Schema:
+    """Return the schema of the connection form prefilled with defaults."""
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_CLOUD_HOST,
+                default=defaults.get(CONF_CLOUD_HOST, ""),
+            ): _text(),
+            vol.Required(
+                CONF_SERIAL_NUMBER,
+                default=defaults.get(CONF_SERIAL_NUMBER, ""),
+            ): _text(),
+            vol.Optional(
+                CONF_CLOUD_PORT,
+                default=int(defaults.get(CONF_CLOUD_PORT, 8883)),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=65535,
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_CLOUD_USER,
+                default=defaults.get(CONF_CLOUD_USER, ""),
+            ): _text(),
+            vol.Optional(
+                CONF_CLOUD_PASSWORD,
+                default=defaults.get(CONF_CLOUD_PASSWORD, ""),
+            ): _text(selector.TextSelectorType.PASSWORD),
+            vol.Optional(
+                "code",
+                default=defaults.get("code", "8888"),
+            ): _text(),
+            vol.Optional(
+                CONF_CA_CERTS,
+                default=defaults.get(CONF_CA_CERTS, ""),
+            ): _text(),
+            vol.Optional(
+                CONF_CLIENT_CERT,
+                default=defaults.get(CONF_CLIENT_CERT, ""),
+            ): _text(),
+            vol.Optional(
+                CONF_CLIENT_KEY,
+                default=defaults.get(CONF_CLIENT_KEY, ""),
+            ): _text(),
+        }
+    )
+
 
 class PulsonAlarmFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     """Config flow for PulsonAlarm."""
 
     VERSION = 1
+    # 2: unique id of the entry and its entities include the serial number
+    MINOR_VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> PulsonAlarmOptionsFlow:
+        """Return the options flow of an entry."""
+        return PulsonAlarmOptionsFlow()
 
     async def async_step_user(
         self,
@@ -43,124 +180,136 @@ class PulsonAlarmFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle a flow initialized by the user."""
         _errors = {}
 
-        # Wczytaj domyślne wartości z JSON
-        default_values = {}
-        try:
-            file_path = Path(__file__).parent / "default_log.json"
-            with file_path.open("r", encoding="utf-8") as f:
-                default_values = json.load(f)
-        except FileNotFoundError:
-            LOGGER.warning("File default_log.json does not exist.")
-        except json.JSONDecodeError as e:
-            LOGGER.error("JSON decode error in default_log.json: %s", e)
-        except OSError as e:
-            LOGGER.error("I/O error reading default_log.json: %s", e)
-
         # Jeżeli użytkownik wysłał dane
         if user_input is not None:
-            try:
-                await self._test_credentials(
-                    mqtt_host=user_input[CONF_CLOUD_HOST],
-                    mqtt_port=user_input[CONF_CLOUD_PORT],
-                    mqtt_username=user_input[CONF_CLOUD_USER],
-                    mqtt_password=user_input[CONF_CLOUD_PASSWORD],
-                )
-            except IntegrationPulsonAlarmApiClientAuthenticationError:
-                _errors["base"] = "auth"
-            except IntegrationPulsonAlarmApiClientCommunicationError:
-                _errors["base"] = "connection"
-            except IntegrationPulsonAlarmApiClientError:
-                _errors["base"] = "unknown"
-            else:
-                await self.async_set_unique_id(slugify(user_input[CONF_CLOUD_USER]))
+            _errors = await self._async_validate_input(user_input)
+            if not _errors:
+                # Panels of one account share its MQTT connection
+                await self.async_set_unique_id(user_input[CONF_SERIAL_NUMBER])
                 self._abort_if_unique_id_configured()
                 return self.async_create_entry(
                     title=user_input[CONF_CLOUD_USER],
                     data=user_input,
                 )
 
-        schema = vol.Schema(
-            {
-                vol.Required(
-                    CONF_CLOUD_HOST,
-                    default=default_values.get(CONF_CLOUD_HOST, ""),
-                ): selector.TextSelector(
-                    selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT)
-                ),
-                vol.Required(
-                    CONF_SERIAL_NUMBER,
-                    default=default_values.get(CONF_SERIAL_NUMBER, ""),
-                ): selector.TextSelector(
-                    selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT)
-                ),
-                vol.Optional(
-                    CONF_CLOUD_PORT,
-                    default=int(default_values.get(CONF_CLOUD_PORT, 8883)),
-                ): selector.NumberSelector(
-                    selector.NumberSelectorConfig(
-                        min=1,
-                        max=65535,
-                        mode=selector.NumberSelectorMode.BOX,
-                    )
-                ),
-                vol.Optional(
-                    CONF_CLOUD_USER,
-                    default=default_values.get(CONF_CLOUD_USER, ""),
-                ): selector.TextSelector(
-                    selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT)
-                ),
-                vol.Optional(
-                    CONF_CLOUD_PASSWORD,
-                    default=default_values.get(CONF_CLOUD_PASSWORD, ""),
-                ): selector.TextSelector(
-                    selector.TextSelectorConfig(type=selector.TextSelectorType.PASSWORD)
-                ),
-                vol.Optional(
-                    "code",
-                    default=default_values.get("code", "8888"),
-                ): selector.TextSelector(
-                    selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT)
-                ),
-            }
-        )
-
         return self.async_show_form(
             step_id="user",
-            data_schema=schema,
+            data_schema=_connection_schema(await async_get_defaults(self.hass)),
             errors=_errors,
         )
 
-    async def _test_credentials(
+    async def async_step_reconfigure(
         self,
-        mqtt_host: str,
-        mqtt_port: int,
-        mqtt_username: str,
-        mqtt_password: str,
-    ) -> None:
-        """Test if provided credentials allow access to the API and MQTT."""
-        LOGGER.info("Start testing credentials")
-        cfg = PulsonConfig(
-            host=mqtt_host,
-            username=mqtt_username,
-            password=mqtt_password,
-            serial_number="",
-            port=int(mqtt_port),
-            user_code="",
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Change the connection settings of an existing entry."""
+        entry = self._get_reconfigure_entry()
+        _errors = {}
+
+        if user_input is not None:
+            _errors = await self._async_validate_input(user_input)
+            if not _errors:
+                await self.async_set_unique_id(user_input[CONF_SERIAL_NUMBER])
+                self._abort_if_unique_id_mismatch()
+                # The update listener of the entry reloads it once
+                self.hass.config_entries.async_update_entry(
+                    entry, data={**entry.data, **user_input}
+                )
+                return self.async_abort(reason="reconfigure_successful")
+
+        defaults = {**await async_get_defaults(self.hass), **entry.data}
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=_connection_schema(defaults),
+            errors=_errors,
         )
+
+    async def _async_validate_input(self, user_input: dict) -> dict[str, str]:
+        """Test the connection settings and return form errors."""
+        try:
+            await self._test_credentials(
+                PulsonConfig(
+                    host=user_input[CONF_CLOUD_HOST],
+                    username=user_input[CONF_CLOUD_USER],
+                    password=user_input[CONF_CLOUD_PASSWORD],
+                    serial_number="",
+                    port=int(user_input[CONF_CLOUD_PORT]),
+                    user_code="",
+                    ca_certs=user_input.get(CONF_CA_CERTS) or None,
+                    certfile=user_input.get(CONF_CLIENT_CERT) or None,
+                    keyfile=user_input.get(CONF_CLIENT_KEY) or None,
+                )
+            )
+        except IntegrationPulsonAlarmApiClientAuthenticationError:
+            return {"base": "auth"}
+        except IntegrationPulsonAlarmApiClientCommunicationError:
+            return {"base": "connection"}
+        except IntegrationPulsonAlarmApiClientError:
+            return {"base": "unknown"}
+        return {}
+
+    async def _test_credentials(self, cfg: PulsonConfig) -> None:
+        """Test if provided credentials allow access to the MQTT broker."""
+        LOGGER.info("Start testing credentials")
         mqtt_client = PulsonMqttClient(cfg)
 
         try:
             try:
                 await mqtt_client.start(None)
+            except MqttCodeError as e:
+                msg = f"MQTT test failed: {e}"
+                if e.rc in MQTT_AUTH_ERROR_CODES:
+                    raise IntegrationPulsonAlarmApiClientAuthenticationError(msg) from e
+                raise IntegrationPulsonAlarmApiClientCommunicationError(msg) from e
             except MqttError as e:
-                msg = "MQTT test failed"
-                raise MqttError(msg) from e
-            api_client = IntegrationPulsonAlarmApiClient(
-                session=async_create_clientsession(self.hass),
-                mqtt_client=mqtt_client,
-            )
-            await api_client.async_get_data()
-
+                msg = f"MQTT test failed: {e}"
+                raise IntegrationPulsonAlarmApiClientCommunicationError(msg) from e
         finally:
             LOGGER.info("Form data correct, credentials accepted and tested")
             await mqtt_client.stop()
+
+
+class PulsonAlarmOptionsFlow(config_entries.OptionsFlow):
+    """Options flow tuning how updates of a panel are handled."""
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        defaults = {
+            CONF_UPDATE_WINDOW: DEFAULT_UPDATE_WINDOW,
+            CONF_UPDATE_MAX_LATENCY: DEFAULT_UPDATE_MAX_LATENCY,
+            CONF_IDLE_TIMEOUT: DEFAULT_IDLE_TIMEOUT,
+            CONF_METRICS: False,
+            CONF_HISTORY_FILE: False,
+            CONF_COLUMN_STORE: False,
+            **await async_get_defaults(self.hass),
+            **self.config_entry.options,
+        }
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_UPDATE_WINDOW, default=defaults[CONF_UPDATE_WINDOW]
+                ): _seconds(0, 5, 0.01),
+                vol.Optional(
+                    CONF_UPDATE_MAX_LATENCY, default=defaults[CONF_UPDATE_MAX_LATENCY]
+                ): _seconds(0, 5, 0.01),
+                vol.Optional(
+                    CONF_IDLE_TIMEOUT, default=defaults[CONF_IDLE_TIMEOUT]
+                ): _seconds(30, 3600, 1),
+                vol.Optional(
+                    CONF_METRICS, default=defaults[CONF_METRICS]
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_HISTORY_FILE, default=defaults[CONF_HISTORY_FILE]
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_COLUMN_STORE, default=defaults[CONF_COLUMN_STORE]
+                ): selector.BooleanSelector(),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
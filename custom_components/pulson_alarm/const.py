@@ -1,17 +1,84 @@
 """Constants for pulson_alarm."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "pulson_alarm"
-ATTRIBUTION = "Data provided by http://jsonplaceholder.typicode.com/"
+MANUFACTURER = "Pulson Alarm"
+DATA_CONNECTION_MANAGER = f"{DOMAIN}_connections"
+ATTRIBUTION = "Data provided by Pulson Alarm cloud"
 
 CONF_SERIAL_NUMBER = "serial_number"
 CONF_CLOUD_HOST = "host"
 CONF_CLOUD_USER = "username"
 CONF_CLOUD_PASSWORD = "password"  # noqa: S105
 CONF_CLOUD_PORT = "port"
+CONF_CA_CERTS = "ca_certs"
+CONF_CLIENT_CERT = "client_cert"
+CONF_CLIENT_KEY = "client_key"
+CONF_UPDATE_WINDOW = "update_window"
+CONF_UPDATE_MAX_LATENCY = "update_max_latency"
+CONF_METRICS = "metrics"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_COLUMN_STORE = "column_store"
+CONF_HISTORY_FILE = "history_file"
+
+# Lines of a panel the column store holds at most
+COLUMN_STORE_MAX_INPUTS = 4096
+
+# Seconds to coalesce state writes for, and the upper bound of their delay
+DEFAULT_UPDATE_WINDOW = 0.05
+DEFAULT_UPDATE_MAX_LATENCY = 0.25
+
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_INTERVAL = timedelta(minutes=15)
+
+# Seconds without messages from a connected panel before its retained state
+# is requested again
+DEFAULT_IDLE_TIMEOUT = 300
+# How often idleness is checked, also the time the retained state may take
+HEALTH_CHECK_INTERVAL = timedelta(seconds=30)
+
+# Seconds to wait for the state topic confirming a command
+DEFAULT_COMMAND_TIMEOUT = 10.0
+# Commands are published with QoS 1, at most this many awaiting PUBACK at once
+COMMAND_QOS = 1
+COMMAND_INFLIGHT_WINDOW = 8
+
+# Outbound queue: capacity, seconds a message may wait, and the send rate
+# limit as messages per second with the size of a burst
+OUTBOX_SIZE = 64
+OUTBOX_TTL = 5.0
+OUTBOX_RATE = 5.0
+OUTBOX_BURST = 20
+
+# Changes kept in memory, how often they are appended to the history file
+# when enabled, and the size at which the file is rotated
+HISTORY_SIZE = 2048
+HISTORY_WRITE_INTERVAL = timedelta(minutes=1)
+HISTORY_FILE_MAX_BYTES = 4 * 1024 * 1024
+
+# Seconds an exit time tick may differ from the local deadline before the
+# deadline is corrected
+EXIT_TIME_MAX_DRIFT = 2.0
+
+# Seconds between debug log lines of messages of the same topic
+LOG_SAMPLE_INTERVAL = 10.0
+
+# Seconds to wait for CONNACK and SUBACK of the first connection
+MQTT_CONNECT_TIMEOUT = 10.0
+
+# CONNACK codes: bad user name or password, not authorized
+MQTT_AUTH_ERROR_CODES = (4, 5)
+
+# Seconds to gather newly discovered objects before creating their entities
+DEFAULT_DISCOVERY_WINDOW = 0.2
+
+# Seconds between MQTT reconnect attempts, doubled after each failure
+MQTT_RECONNECT_MIN_DELAY = 0.25
+MQTT_RECONNECT_MAX_DELAY = 15.0
 
 CLOUD_TOPIC_SYSTEM_INDEX = 0
 CLOUD_TOPIC_SYSTEMID_INDEX = 1
@@ -19,3 +86,8 @@ CLOUD_TOPIC_MODULE_INDEX = 2
 CLOUD_TOPIC_NUMBER_INDEX = 3
 CLOUD_TOPIC_ACTION_INDEX = 4
 CLOUD_TOPIC_SUBTYPE_INDEX = 5
+
+TOPIC_ROOT = "system"
+TOPIC_MODULE_INPUTS = "inputs"
+TOPIC_MODULE_PARTITIONS = "partitions"
+TOPIC_CACHE_SIZE = 4096
@@ -2,54 +2,115 @@
 
 from __future__ import annotations
 
+import time
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .api import (
-    IntegrationPulsonAlarmApiClient,
-    IntegrationPulsonAlarmApiClientAuthenticationError,
-    IntegrationPulsonAlarmApiClientError,
-)
+from .api import IntegrationPulsonAlarmApiClientCommunicationError
+from .const import DEFAULT_IDLE_TIMEOUT, DOMAIN, HEALTH_CHECK_INTERVAL, LOGGER
 
 if TYPE_CHECKING:
-    from datetime import timedelta
-    from logging import Logger
+    from collections.abc import Callable
 
     from homeassistant.core import HomeAssistant
 
+    from .api import IntegrationPulsonAlarmApiClient
     from .data import IntegrationPulsonAlarmConfigEntry
+    from .router import PulsonTopicRouter
 
 
-# https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-class PulsonAlarmDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+class PulsonAlarmDataUpdateCoordinator(DataUpdateCoordinator[int]):
+    """
+    Coordinator of a panel whose data is pushed over MQTT.
+
+    Nothing is polled; the data is the version of the MQTT-fed model.
+    Entities are available while the MQTT connection is up, which the API
+    client tracks. A periodic health check watches the message counter of
+    the router. When a connected panel stays silent for ``idle_timeout``
+    seconds, its topics are subscribed again, which makes the broker resend
+    the retained state. If that brings no message by the next check either,
+    the session is considered dead and the MQTT connection is reconnected,
+    so entities are unavailable until it is back.
+    """
+
+    config_entry: IntegrationPulsonAlarmConfigEntry
 
     def __init__(
         self,
         hass: HomeAssistant,
-        logger: Logger,
-        name: str,
-        update_interval: timedelta,
         api_client: IntegrationPulsonAlarmApiClient,
+        router: PulsonTopicRouter,
+        *,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
     ) -> None:
         """Initialize the coordinator."""
-        super().__init__(
-            hass,
-            logger=logger,
-            name=name,
-            update_interval=update_interval,
-        )
+        super().__init__(hass, logger=LOGGER, name=DOMAIN, update_interval=None)
         self.api_client = api_client
+        self._router = router
+        self._idle_timeout = idle_timeout
+        self._messages = router.messages
+        self._last_activity = time.monotonic()
+        self._probe_sent: float | None = None
+        self.probes = 0
+        self.missed_heartbeats = 0
+        self.state_writes = 0
+        self.state_writes_skipped = 0
 
-    config_entry: IntegrationPulsonAlarmConfigEntry
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return health check state and counters of entity state writes."""
+        return {
+            "idle_timeout": self._idle_timeout,
+            "idle": round(time.monotonic() - self._last_activity, 1),
+            "probes": self.probes,
+            "missed_heartbeats": self.missed_heartbeats,
+            "state_writes": self.state_writes,
+            "state_writes_skipped": self.state_writes_skipped,
+        }
 
-    async def _async_update_data(self) -> Any:
-        """Update data via library."""
-        try:
-            return await self.config_entry.runtime_data.api_client.async_get_data()
-        except IntegrationPulsonAlarmApiClientAuthenticationError as exception:
-            raise ConfigEntryAuthFailed(exception) from exception
-        except IntegrationPulsonAlarmApiClientError as exception:
-            raise UpdateFailed(exception) from exception
+    async def _async_update_data(self) -> int:
+        """Return the version of the model, which MQTT keeps up to date."""
+        return self.api_client.version
+
+    def async_start_health_check(self) -> Callable[[], None]:
+        """Start checking that the panel is alive; return a function to stop."""
+        return async_track_time_interval(
+            self.hass, self._async_check_health, HEALTH_CHECK_INTERVAL
+        )
+
+    async def _async_check_health(self, _now: Any) -> None:
+        """Probe a connected panel silent for too long, reconnect if it stays so."""
+        now = time.monotonic()
+        messages = self._router.messages
+        if messages != self._messages or not self.api_client.connected:
+            # A lost connection already makes entities unavailable
+            self._messages = messages
+            self._last_activity = now
+            self._probe_sent = None
+            return
+        if now - self._last_activity < self._idle_timeout:
+            return
+        serial_number = self.api_client.serial_number
+        if self._probe_sent is None:
+            LOGGER.debug(
+                "No messages from %s for %.0f s, requesting retained state",
+                serial_number,
+                now - self._last_activity,
+            )
+            self._probe_sent = now
+            self.probes += 1
+            try:
+                await self.api_client.probe()
+            except IntegrationPulsonAlarmApiClientCommunicationError as err:
+                LOGGER.debug("%s", err)
+            else:
+                return
+        # No answer to the probe: the session is dead although still open
+        self.missed_heartbeats += 1
+        self._last_activity = now
+        self._probe_sent = None
+        self.api_client.reconnect(
+            f"no messages from panel {serial_number} after requesting its state"
+        )
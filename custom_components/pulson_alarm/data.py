@@ -11,6 +11,11 @@ if TYPE_CHECKING:
 
     from .api import IntegrationPulsonAlarmApiClient
     from .coordinator import PulsonAlarmDataUpdateCoordinator
+    from .discovery import PulsonDiscoveryQueue
+    from .metrics import PulsonIngestMetrics
+    from .router import PulsonTopicRouter
+    from .scheduler import PulsonUpdateScheduler
+    from .snapshot import PulsonSnapshotStore
 
 
 type IntegrationPulsonAlarmConfigEntry = ConfigEntry[IntegrationPulsonAlarmData]
@@ -23,3 +28,8 @@ class IntegrationPulsonAlarmData:
     api_client: IntegrationPulsonAlarmApiClient
     coordinator: PulsonAlarmDataUpdateCoordinator
     integration: Integration
+    scheduler: PulsonUpdateScheduler
+    router: PulsonTopicRouter
+    snapshot: PulsonSnapshotStore
+    discovery: PulsonDiscoveryQueue
+    metrics: PulsonIngestMetrics | None = None
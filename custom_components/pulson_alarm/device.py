@@ -0,0 +1,134 @@
+"""Device registry metadata of the panel, its lines and partitions."""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN, MANUFACTURER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Prefixes of identifiers used before they included the serial number
+_LEGACY_PREFIXES = ("line_", "partition_")
+# Prefix of former devices of alarm panel entities, one per partition
+_LEGACY_PANEL_PREFIX = "partition_alarm_panel_"
+
+
+@cache
+def hub_device_info(serial_number: str) -> DeviceInfo:
+    """Return device info of the alarm panel itself."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, serial_number)},
+        name=f"Pulson Alarm {serial_number}",
+        manufacturer=MANUFACTURER,
+        model="Centrala alarmowa",
+        serial_number=serial_number,
+    )
+
+
+@cache
+def line_device_info(serial_number: str, input_id: str) -> DeviceInfo:
+    """Return device info of an input line connected to the panel."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"{serial_number}_line_{input_id}")},
+        name=f"Linia {input_id}",
+        manufacturer=MANUFACTURER,
+        model="Wejście alarmowe",
+        via_device=(DOMAIN, serial_number),
+    )
+
+
+@cache
+def partition_device_info(serial_number: str, partition_id: str) -> DeviceInfo:
+    """Return device info of a partition of the panel."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"{serial_number}_partition_{partition_id}")},
+        name=f"Partycja {partition_id}",
+        manufacturer=MANUFACTURER,
+        model="Partycja",
+        via_device=(DOMAIN, serial_number),
+    )
+
+
+@callback
+def async_migrate_device_identifiers(
+    hass: HomeAssistant, entry_id: str, serial_number: str
+) -> None:
+    """
+    Add the serial number to identifiers of line and partition devices.
+
+    Lines and partitions of different panels used to share devices, which
+    then belong to several config entries. Such a device is kept by the
+    entry whose entities are attached to it; other entries leave it and get
+    new devices when their entities are added. Separate devices of alarm
+    panel entities, which now belong to their partition device, are removed
+    once their entities are moved.
+    """
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    panels = []
+    for device in dr.async_entries_for_config_entry(device_registry, entry_id):
+        legacy = {
+            identifier
+            for identifier in device.identifiers
+            if identifier[0] == DOMAIN and identifier[1].startswith(_LEGACY_PREFIXES)
+        }
+        if not legacy:
+            continue
+        if any(name.startswith(_LEGACY_PANEL_PREFIX) for _, name in legacy):
+            panels.append((device, legacy))
+            continue
+        entities = _entities_of(entity_registry, device.id, entry_id)
+        if not entities and len(device.config_entries) > 1:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry_id
+            )
+            continue
+        migrated = {(DOMAIN, f"{serial_number}_{name}") for _, name in legacy}
+        if device_registry.async_get_device(identifiers=migrated) is not None:
+            continue
+        device_registry.async_update_device(
+            device.id, new_identifiers=(device.identifiers - legacy) | migrated
+        )
+        for other_entry_id in device.config_entries - {entry_id}:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=other_entry_id
+            )
+    for device, legacy in panels:
+        entities = _entities_of(entity_registry, device.id, entry_id)
+        if not entities and len(device.config_entries) > 1:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry_id
+            )
+            continue
+        for _, name in legacy:
+            partition_id = name.removeprefix(_LEGACY_PANEL_PREFIX)
+            partition = device_registry.async_get_or_create(
+                config_entry_id=entry_id,
+                **partition_device_info(serial_number, partition_id),
+            )
+            for entity in entities:
+                entity_registry.async_update_entity(
+                    entity.entity_id, device_id=partition.id
+                )
+        device_registry.async_remove_device(device.id)
+
+
+def _entities_of(
+    entity_registry: er.EntityRegistry, device_id: str, entry_id: str
+) -> list[er.RegistryEntry]:
+    """Return registry entries of a config entry attached to a device."""
+    return [
+        entity
+        for entity in er.async_entries_for_device(
+            entity_registry, device_id, include_disabled_entities=True
+        )
+        if entity.config_entry_id == entry_id
+    ]
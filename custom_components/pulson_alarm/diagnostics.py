@@ -0,0 +1,44 @@
+"""Diagnostics support for pulson_alarm."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import CONF_CLOUD_PASSWORD, CONF_CLOUD_USER, DOMAIN
+from .tls import ssl_context_stats
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import IntegrationPulsonAlarmConfigEntry
+
+TO_REDACT = {CONF_CLOUD_PASSWORD, CONF_CLOUD_USER, "code"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: IntegrationPulsonAlarmConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime_data = entry.runtime_data
+    return {
+        "commands": runtime_data.api_client.commands.stats,
+        "coordinator": runtime_data.coordinator.stats,
+        "discovery": runtime_data.discovery.stats,
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "exit_ticks_skipped": runtime_data.api_client.exit_ticks_skipped,
+        "history": {
+            **runtime_data.api_client.history.stats,
+            "events": runtime_data.api_client.history.query(),
+        },
+        "metrics": None if runtime_data.metrics is None else runtime_data.metrics.stats,
+        "mqtt": hass.data[DOMAIN][entry.entry_id]["mqtt_client"].metrics,
+        "router": runtime_data.router.stats,
+        "scheduler": runtime_data.scheduler.stats,
+        "tls": ssl_context_stats(),
+    }
@@ -0,0 +1,90 @@
+"""Batching of entity creation for newly discovered inputs and partitions."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .const import DEFAULT_DISCOVERY_WINDOW
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable
+
+
+class PulsonDiscoveryQueue:
+    """
+    Gather ids of newly discovered objects and add their entities in batches.
+
+    The first discovery starts a window of ``window`` seconds; when it ends
+    every platform adder is called once with all ids queued for it, so the
+    platform registers the whole batch in a single async_add_entities call.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        window: float = DEFAULT_DISCOVERY_WINDOW,
+    ) -> None:
+        """Initialize an empty queue."""
+        self._loop = loop
+        self._window = window
+        self._pending: dict[Callable[..., None], dict[str, float]] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self.discovered = 0
+        self.batches = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return counters and discovery-to-entity latency in seconds."""
+        return {
+            "window": self._window,
+            "discovered": self.discovered,
+            "batches": self.batches,
+            "latency_avg": (
+                round(self._latency_total / self.discovered, 4)
+                if self.discovered
+                else None
+            ),
+            "latency_max": round(self._latency_max, 4),
+        }
+
+    def wrap(self, add_entities: Callable[..., None]) -> Callable[[str], None]:
+        """Return an 'added' callback which queues ids for the given adder."""
+
+        def _enqueue(object_id: str) -> None:
+            self.enqueue(add_entities, object_id)
+
+        return _enqueue
+
+    def enqueue(self, add_entities: Callable[..., None], object_id: str) -> None:
+        """Queue an id to be passed to the adder on the next flush."""
+        self._pending.setdefault(add_entities, {}).setdefault(
+            object_id, self._loop.time()
+        )
+        if self._handle is None:
+            self._handle = self._loop.call_later(self._window, self.flush)
+
+    def flush(self) -> None:
+        """Call every adder once with all ids queued for it."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        pending, self._pending = self._pending, {}
+        now = self._loop.time()
+        for add_entities, ids in pending.items():
+            add_entities(*ids)
+            self.batches += 1
+            for queued_at in ids.values():
+                latency = now - queued_at
+                self.discovered += 1
+                self._latency_total += latency
+                self._latency_max = max(self._latency_max, latency)
+
+    def stop(self) -> None:
+        """Cancel the pending flush and drop queued ids."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending.clear()
@@ -2,11 +2,30 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .api import IntegrationPulsonAlarmApiClientError
 from .const import ATTRIBUTION
 from .coordinator import PulsonAlarmDataUpdateCoordinator
+from .device import line_device_info, partition_device_info
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+    from .api import IntegrationPulsonAlarmApiClient
+
+
+async def async_run_command(command: Awaitable[None]) -> None:
+    """Await a panel command, raising HomeAssistantError if it failed."""
+    try:
+        await command
+    except IntegrationPulsonAlarmApiClientError as err:
+        raise HomeAssistantError(str(err)) from err
 
 
 class IntegrationPulsonAlarmEntity(CoordinatorEntity[PulsonAlarmDataUpdateCoordinator]):
@@ -26,3 +45,120 @@ class IntegrationPulsonAlarmEntity(CoordinatorEntity[PulsonAlarmDataUpdateCoordi
                 ),
             },
         )
+
+
+class PulsonAlarmObjectEntity(CoordinatorEntity[PulsonAlarmDataUpdateCoordinator]):
+    """
+    Base class for entities bound to an input or a partition of a panel.
+
+    All entities of an object are notified when any of its values changes,
+    so a state is written only if what it renders differs from the last
+    write; otherwise each unrelated change would cost a state write.
+    """
+
+    _rendered: tuple[Any, ...] | None = None
+
+    def _update_attrs(self) -> None:
+        """Cache attributes derived from the object state, called on change."""
+
+    def _render(self) -> tuple[Any, ...]:
+        """Return everything a state write would publish."""
+        return (
+            self.available,
+            self.state,
+            self.extra_state_attributes,
+            self.icon,
+            self.assumed_state,
+        )
+
+    @callback
+    def _handle_object_update(self) -> None:
+        """Refresh cached attributes and write the state if it changed."""
+        self._update_attrs()
+        rendered = self._render()
+        if rendered == self._rendered:
+            self.coordinator.state_writes_skipped += 1
+            return
+        self._rendered = rendered
+        self.coordinator.state_writes += 1
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state unconditionally, e.g. when the connection changes."""
+        self._update_attrs()
+        self._rendered = self._render()
+        self.coordinator.state_writes += 1
+        super()._handle_coordinator_update()
+
+
+class PulsonAlarmInputEntity(PulsonAlarmObjectEntity):
+    """Base class for entities bound to a single alarm input line."""
+
+    def __init__(
+        self,
+        coordinator: PulsonAlarmDataUpdateCoordinator,
+        input_id: str,
+        api: IntegrationPulsonAlarmApiClient,
+    ) -> None:
+        """Store the input this entity represents."""
+        super().__init__(coordinator)
+        self._input_id = input_id
+        self._api = api
+        self._attr_device_info = line_device_info(api.serial_number, input_id)
+
+    @property
+    def available(self) -> bool:
+        """Return True if the panel connection is up."""
+        return super().available and self._api.connected
+
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the state is restored and not confirmed yet."""
+        return self._api.input_get_state(self._input_id).stale
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to changes of the bound input only."""
+        await super().async_added_to_hass()
+        self._update_attrs()
+        self.async_on_remove(
+            self._api.input_register_update_callback(
+                self._input_id, self._handle_object_update
+            )
+        )
+
+
+class PulsonAlarmPartitionEntity(PulsonAlarmObjectEntity):
+    """Base class for entities bound to a single alarm partition."""
+
+    def __init__(
+        self,
+        coordinator: PulsonAlarmDataUpdateCoordinator,
+        partition_id: str,
+        api: IntegrationPulsonAlarmApiClient,
+    ) -> None:
+        """Store the partition this entity represents."""
+        super().__init__(coordinator)
+        self._partition_id = partition_id
+        self._api = api
+        self._attr_device_info = partition_device_info(api.serial_number, partition_id)
+
+    @property
+    def available(self) -> bool:
+        """Return True if the panel connection is up."""
+        return super().available and self._api.connected
+
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the state is restored and not confirmed yet."""
+        return self._api.partition_get_state(self._partition_id).stale
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to changes of the bound partition only."""
+        await super().async_added_to_hass()
+        self._update_attrs()
+        self.async_on_remove(
+            self._api.partition_register_update_callback(
+                self._partition_id, self._handle_object_update
+            )
+        )
@@ -0,0 +1,177 @@
+"""In-memory history of changes of inputs and partitions."""
+
+from __future__ import annotations
+
+import heapq
+import json
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from .const import HISTORY_FILE_MAX_BYTES, HISTORY_SIZE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+# timestamp, module, object id, key, old value, new value
+type HistoryEvent = tuple[float, str, str, str, Any, Any]
+
+
+class PulsonEventHistory:
+    """
+    Bounded ring buffer of value changes, indexed by object and time.
+
+    Events are stored as compact tuples in a preallocated list; once full,
+    each new event overwrites the oldest one. Timestamps never decrease, so
+    a time range is found by binary search, and each object keeps a queue
+    of positions of its own events to answer per-line queries without a
+    scan. Events can also be collected for appending to a file.
+    """
+
+    def __init__(
+        self,
+        size: int = HISTORY_SIZE,
+        *,
+        spill: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Set the capacity, whether events are kept for a file, and the clock."""
+        self._size = size
+        self._events: list[HistoryEvent | None] = [None] * size
+        # Per slot, the positions of events of the same object
+        self._positions: list[deque[int] | None] = [None] * size
+        self._next = 0  # sequence number of the next event
+        self._last = 0.0
+        self._clock = clock
+        self._index: dict[tuple[str, str], deque[int]] = {}
+        self._unwritten: deque[HistoryEvent] | None = (
+            deque(maxlen=size) if spill else None
+        )
+        self.written = 0
+
+    def __len__(self) -> int:
+        """Return the number of events held."""
+        return min(self._next, self._size)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return capacity and counters of the history."""
+        return {
+            "size": self._size,
+            "events": len(self),
+            "recorded": self._next,
+            "objects": len(self._index),
+            "unwritten": None if self._unwritten is None else len(self._unwritten),
+            "written": self.written,
+        }
+
+    def record(self, module: str, object_id: str, key: str, old: Any, new: Any) -> None:
+        """Append a change of a value of an object."""
+        now = self._clock()
+        if now < self._last:
+            # Wall clock stepped back; keep the order needed by range queries
+            now = self._last
+        else:
+            self._last = now
+        event = (now, module, object_id, key, old, new)
+        seq = self._next
+        slot = seq % self._size
+        index = self._index
+        evicted = self._positions[slot]
+        if evicted is not None:
+            # The evicted event is the oldest one of its object
+            evicted.popleft()
+            if not evicted:
+                _, evicted_module, evicted_id, *_ = self._events[slot]
+                del index[evicted_module, evicted_id]
+        positions = index.get((module, object_id))
+        if positions is None:
+            positions = index[module, object_id] = deque()
+        positions.append(seq)
+        self._positions[slot] = positions
+        self._events[slot] = event
+        self._next = seq + 1
+        if self._unwritten is not None:
+            self._unwritten.append(event)
+
+    def query(
+        self,
+        module: str | None = None,
+        object_id: str | None = None,
+        start: float | None = None,
+        end: float | None = None,
+        limit: int | None = None,
+    ) -> list[HistoryEvent]:
+        """
+        Return events in chronological order, optionally filtered.
+
+        With an object id only the events of that object are visited.
+        ``start`` and ``end`` bound timestamps inclusively, and ``limit``
+        keeps the latest events.
+        """
+        first = self._next - len(self)
+        if object_id is not None:
+            seqs: Any = heapq.merge(
+                *(
+                    positions
+                    for (event_module, event_id), positions in self._index.items()
+                    if event_id == object_id and module in (None, event_module)
+                )
+            )
+        else:
+            lo = first if start is None else self._bisect(first, start)
+            seqs = range(lo, self._next)
+        events = []
+        for seq in seqs:
+            event = self._events[seq % self._size]
+            if event is None:
+                continue
+            if start is not None and event[0] < start:
+                continue
+            if end is not None and event[0] > end:
+                break
+            if module is not None and event[1] != module:
+                continue
+            events.append(event)
+        if limit is not None:
+            return events[-limit:] if limit > 0 else []
+        return events
+
+    def _bisect(self, first: int, timestamp: float) -> int:
+        """Return the sequence number of the first event not older than timestamp."""
+        lo, hi = first, self._next
+        while lo < hi:
+            mid = (lo + hi) // 2
+            event = self._events[mid % self._size]
+            if event is not None and event[0] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def take_unwritten(self) -> list[HistoryEvent]:
+        """Return events not yet appended to the file and forget them."""
+        if not self._unwritten:
+            return []
+        events = list(self._unwritten)
+        self._unwritten.clear()
+        self.written += len(events)
+        return events
+
+
+def append_events(path: Path, events: list[HistoryEvent]) -> None:
+    """
+    Append events to a file as JSON lines.
+
+    A file grown over the size limit is renamed with a ``.1`` suffix first,
+    replacing the previous one. Does blocking I/O, so it must run in the
+    executor.
+    """
+    try:
+        if path.stat().st_size > HISTORY_FILE_MAX_BYTES:
+            path.replace(path.with_name(path.name + ".1"))
+    except FileNotFoundError:
+        pass
+    with path.open("a", encoding="utf-8") as f:
+        f.writelines(json.dumps(event) + "\n" for event in events)
@@ -0,0 +1,110 @@
+"""Sampled logging and on-demand tracing of MQTT messages."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from .const import LOG_SAMPLE_INTERVAL, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class PulsonMessageLog:
+    """
+    Log received and published MQTT messages without flooding the log.
+
+    With debug logging on, each topic is logged at most once per sampling
+    interval and the next line tells how many messages were skipped, so a
+    busy panel cannot dominate CPU time or the log file. Traces log every
+    message of topics with a given prefix at info level for a limited time,
+    without enabling debug logging of the whole integration. Payloads are
+    only formatted when a line is actually emitted.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger = LOGGER,
+        interval: float = LOG_SAMPLE_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Set the logger, the sampling interval per topic and the clock."""
+        self._logger = logger
+        self._interval = interval
+        self._clock = clock
+        # topic -> (time of the last logged message, messages skipped since)
+        self._sampled: dict[str, tuple[float, int]] = {}
+        self._traces: dict[str, float] = {}
+        self._prefixes: tuple[str, ...] = ()
+
+    @property
+    def traces(self) -> dict[str, float]:
+        """Return traced topic prefixes with seconds left of their tracing."""
+        now = self._clock()
+        return {
+            prefix: round(expires - now, 1)
+            for prefix, expires in self._traces.items()
+            if expires > now
+        }
+
+    def trace(self, prefix: str, duration: float) -> None:
+        """Log every message of topics starting with prefix for duration seconds."""
+        if duration > 0:
+            self._traces[prefix] = self._clock() + duration
+            self._logger.info("MQTT tracing %r for %s s", prefix, duration)
+        elif self._traces.pop(prefix, None) is not None:
+            self._logger.info("MQTT tracing %r stopped", prefix)
+        self._prefixes = tuple(self._traces)
+
+    def received(self, topic: str, payload: Any) -> None:
+        """Log a received message if it is traced, or a sample of it."""
+        if self._prefixes and topic.startswith(self._prefixes) and self._traced(topic):
+            self._logger.info("MQTT trace: %s -> %s", topic, payload)
+        elif self._logger.isEnabledFor(logging.DEBUG):
+            self._sample(topic, payload)
+
+    def published(self, topic: str, payload: Any, *, with_code: bool = False) -> None:
+        """Log a published message; a user code before the payload is masked."""
+        traced = (
+            self._prefixes and topic.startswith(self._prefixes) and self._traced(topic)
+        )
+        level = logging.INFO if traced else logging.DEBUG
+        if with_code:
+            self._logger.log(level, "MQTT published: %s -> ***/%s", topic, payload)
+        else:
+            self._logger.log(level, "MQTT published: %s -> %s", topic, payload)
+
+    def _traced(self, topic: str) -> bool:
+        """Return True if a trace matching the topic has not expired yet."""
+        now = self._clock()
+        expired = [
+            prefix
+            for prefix, expires in self._traces.items()
+            if expires <= now and topic.startswith(prefix)
+        ]
+        for prefix in expired:
+            del self._traces[prefix]
+            self._logger.info("MQTT tracing %r finished", prefix)
+        if expired:
+            self._prefixes = tuple(self._traces)
+        return bool(self._prefixes) and topic.startswith(self._prefixes)
+
+    def _sample(self, topic: str, payload: Any) -> None:
+        """Log a message unless its topic was logged within the interval."""
+        now = self._clock()
+        last = self._sampled.get(topic)
+        if last is not None and now - last[0] < self._interval:
+            self._sampled[topic] = (last[0], last[1] + 1)
+            return
+        self._sampled[topic] = (now, 0)
+        if last is not None and last[1]:
+            self._logger.debug(
+                "MQTT received: %s -> %s (%s more since last logged)",
+                topic,
+                payload,
+                last[1],
+            )
+        else:
+            self._logger.debug("MQTT received: %s -> %s", topic, payload)
@@ -0,0 +1,134 @@
+"""Timing of the MQTT ingest pipeline, from a received message to a state write."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Any
+
+# Bucket upper bounds in seconds: 1 µs doubling up to ~8.4 s, then overflow
+_BUCKET_BOUNDS = tuple(1e-6 * 2**i for i in range(24))
+
+STAGE_RECEIVE = "receive"
+STAGE_PARSE = "parse"
+STAGE_MODEL = "model"
+STAGE_DISPATCH = "dispatch"
+STAGE_WRITE = "write"
+STAGE_INGEST = "ingest"
+
+STAGES = (
+    STAGE_RECEIVE,
+    STAGE_PARSE,
+    STAGE_MODEL,
+    STAGE_DISPATCH,
+    STAGE_WRITE,
+    STAGE_INGEST,
+)
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations in power-of-two buckets.
+
+    Recording is a bisect and an increment, so it is cheap enough for the
+    per-message path. Percentiles are reported as the upper bound of the
+    bucket they fall into.
+    """
+
+    __slots__ = ("count", "counts", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize empty buckets."""
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a duration in seconds."""
+        self.counts[bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the duration below which the given fraction of samples fall."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index == len(_BUCKET_BOUNDS):
+                    return self.max
+                return min(_BUCKET_BOUNDS[index], self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return count and latencies in milliseconds for diagnostics."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3),
+            "p50_ms": round((self.percentile(0.5) or 0.0) * 1000, 3),
+            "p99_ms": round((self.percentile(0.99) or 0.0) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class PulsonIngestMetrics:
+    """
+    Histograms of the ingest pipeline stages of one panel.
+
+    Components take an optional instance and skip all timing when it is None,
+    so the pipeline pays nothing while metrics are disabled.
+
+    Stages:
+    - receive: synchronous handling of a message by the integration,
+    - parse: splitting of the topic,
+    - model: parsing of the payload and update of the data model,
+    - dispatch: wait of a changed object for the coalesced flush,
+    - write: a single entity state write,
+    - ingest: first change of an object until its entities are written.
+    """
+
+    def __init__(self) -> None:
+        """Initialize histograms of all stages."""
+        self.clock = time.perf_counter
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.messages = 0
+        self._rate_messages = 0
+        self._rate_time = time.monotonic()
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add a duration of a stage."""
+        self.histograms[stage].record(seconds)
+
+    def message_handled(self, start: float) -> None:
+        """Count a message and record its receive stage started at ``start``."""
+        self.messages += 1
+        self.histograms[STAGE_RECEIVE].record(self.clock() - start)
+
+    def rate(self) -> float:
+        """Return messages per second since the previous call."""
+        now = time.monotonic()
+        elapsed = now - self._rate_time
+        messages = self.messages - self._rate_messages
+        self._rate_time = now
+        self._rate_messages = self.messages
+        return round(messages / elapsed, 2) if elapsed > 0 else 0.0
+
+    def ingest_percentile(self, fraction: float) -> float | None:
+        """Return an ingest latency percentile in milliseconds."""
+        value = self.histograms[STAGE_INGEST].percentile(fraction)
+        return None if value is None else round(value * 1000, 3)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return histograms of all stages for diagnostics."""
+        return {
+            "messages": self.messages,
+            **{stage: hist.as_dict() for stage, hist in self.histograms.items()},
+        }
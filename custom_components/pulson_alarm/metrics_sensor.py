@@ -0,0 +1,97 @@
+"""
+Diagnostic sensors of the MQTT ingest pipeline of a panel.
+
+Created only when the metrics option is enabled. They are polled, so reading
+them never adds work to the per-message path.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfTime
+
+from .device import hub_device_info
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .data import IntegrationPulsonAlarmData
+
+
+@dataclass(frozen=True, kw_only=True)
+class PulsonMetricsSensorEntityDescription(SensorEntityDescription):
+    """Description of a metrics sensor and how to read its value."""
+
+    value_fn: Callable[[IntegrationPulsonAlarmData], float | int | None]
+
+
+METRICS_SENSORS: tuple[PulsonMetricsSensorEntityDescription, ...] = (
+    PulsonMetricsSensorEntityDescription(
+        key="message_rate",
+        name="Wiadomości MQTT",
+        icon="mdi:message-processing",
+        native_unit_of_measurement="msg/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.metrics.rate() if data.metrics else None,
+    ),
+    PulsonMetricsSensorEntityDescription(
+        key="ingest_latency_p50",
+        name="Opóźnienie przetwarzania p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: (
+            data.metrics.ingest_percentile(0.5) if data.metrics else None
+        ),
+    ),
+    PulsonMetricsSensorEntityDescription(
+        key="ingest_latency_p99",
+        name="Opóźnienie przetwarzania p99",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: (
+            data.metrics.ingest_percentile(0.99) if data.metrics else None
+        ),
+    ),
+    PulsonMetricsSensorEntityDescription(
+        key="dropped_messages",
+        name="Odrzucone wiadomości",
+        icon="mdi:message-alert",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data.router.unrouted + data.router.failed,
+    ),
+)
+
+
+class PulsonMetricsSensor(SensorEntity):
+    """Diagnostic sensor reporting a metric of the ingest pipeline."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = True
+
+    entity_description: PulsonMetricsSensorEntityDescription
+
+    def __init__(
+        self,
+        data: IntegrationPulsonAlarmData,
+        description: PulsonMetricsSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor of a panel."""
+        self.entity_description = description
+        self._data = data
+        serial_number = data.api_client.serial_number
+        self._attr_unique_id = f"pulson_{serial_number}_{description.key}"
+        self._attr_device_info = hub_device_info(serial_number)
+
+    async def async_update(self) -> None:
+        """Read the current value of the metric."""
+        self._attr_native_value = self.entity_description.value_fn(self._data)
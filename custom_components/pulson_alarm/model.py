@@ -0,0 +1,214 @@
+"""Typed state records of alarm inputs and partitions."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class InputStatus(IntEnum):
+    """Enumaration of input line states."""
+
+    UNKNOWN = 0
+    CLOSED = 1
+    OPEN = 2
+    TAMPER = 3
+    FAULT = 4
+
+
+class PartitionStatus(IntEnum):
+    """Enumaration of partition states."""
+
+    DISARMED = 0
+    ARMED = 1
+    ARMED_NIGHT = 2
+    ENTRY_TIME = 3
+    EXIT_TIME = 4
+    ALARM_INTRUDER = 5
+    ALARM_FIRE = 6
+    ALARM_GAS = 7
+    ALARM_CO = 8
+    ALARM_MEDICAL = 9
+    ALARM_DEFINED = 10
+    ALARM_SABOTAGE_TAMPER = 11
+    ALARM_FLOOD = 12
+    ALARM_TEMPERATURE = 13
+    ENTRY_TIME_NIGHT = 14
+    EXIT_TIME_NIGHT = 15
+    ALARM_PANIC = 16
+    ALARM_HOLDUP = 17
+    ALARM_SABOTAGE_ZONE = 18
+    ALARM_IN_MEMORY = 19
+    UNKNOWN = -1
+
+
+_PARTITION_STATUSES = {status.value: status for status in PartitionStatus}
+_TRUE_VALUES = frozenset({"1", "true", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "off"})
+
+# Payloads arrive as bytes; the common ones are looked up instead of parsed
+_INT_PAYLOADS = {str(number).encode(): number for number in range(256)}
+_BOOL_PAYLOADS = {
+    **{value.encode(): True for value in _TRUE_VALUES},
+    **{value.encode(): False for value in _FALSE_VALUES},
+}
+_PARTITION_STATUS_PAYLOADS = {
+    str(status.value).encode(): status for status in PartitionStatus
+}
+
+
+def _parse_int(value: Any) -> int:
+    """Convert a payload to int, raising ValueError or TypeError if invalid."""
+    number = _INT_PAYLOADS.get(value)
+    return int(value) if number is None else number
+
+
+def _parse_bool(value: Any) -> bool:
+    """Convert a payload such as 1/0 or true/false to bool."""
+    parsed = _BOOL_PAYLOADS.get(value)
+    if parsed is not None:
+        return parsed
+    if isinstance(value, bool | int):
+        return bool(value)
+    text = (value.decode() if isinstance(value, bytes) else str(value)).strip().lower()
+    if text in _TRUE_VALUES:
+        return True
+    if text in _FALSE_VALUES:
+        return False
+    msg = f"Invalid boolean value: {value!r}"
+    raise ValueError(msg)
+
+
+def _parse_partition_status(value: Any) -> PartitionStatus:
+    """Convert a payload to partition status, UNKNOWN for unsupported codes."""
+    status = _PARTITION_STATUS_PAYLOADS.get(value)
+    if status is not None:
+        return status
+    return _PARTITION_STATUSES.get(int(value), PartitionStatus.UNKNOWN)
+
+
+def _apply(
+    record: Any, parsers: dict[str, Callable[[Any], Any]], key: str, value: Any
+) -> bool:
+    """
+    Store a parsed value in a record field; return True if it changed.
+
+    A live value also confirms a record restored from a snapshot, which counts
+    as a change even if the value itself is the same.
+    """
+    parser = parsers.get(key)
+    if parser is None:
+        return False
+    parsed = parser(value)
+    if getattr(record, key) == parsed and not record.stale:
+        return False
+    setattr(record, key, parsed)
+    record.stale = False
+    record.version += 1
+    return True
+
+
+@dataclass(slots=True)
+class InputState:
+    """State of an alarm input line parsed from MQTT payloads."""
+
+    status: int = 0
+    block: bool = False
+    block_enable: bool = False
+    version: int = 0
+    stale: bool = False
+
+    def apply(self, key: str, value: Any) -> bool:
+        """
+        Parse and store a value published for this input.
+
+        Returns True if the stored value changed. Unknown keys are ignored,
+        invalid payloads raise ValueError or TypeError.
+        """
+        return apply_input_value(self, key, value)
+
+    def to_list(self) -> list[int]:
+        """Return values in compact form used by snapshots."""
+        return [self.status, int(self.block), int(self.block_enable)]
+
+    @classmethod
+    def from_list(cls, values: list[int]) -> InputState:
+        """Create a stale record from values stored by to_list()."""
+        status, block, block_enable = values
+        return cls(
+            status=int(status),
+            block=bool(block),
+            block_enable=bool(block_enable),
+            stale=True,
+        )
+
+
+@dataclass(slots=True)
+class PartitionState:
+    """State of an alarm partition parsed from MQTT payloads."""
+
+    status: PartitionStatus = PartitionStatus.UNKNOWN
+    ready: bool = False
+    exit_time: int = 0
+    night_mode: bool = False
+    active: bool = False
+    version: int = 0
+    stale: bool = False
+
+    def apply(self, key: str, value: Any) -> bool:
+        """
+        Parse and store a value published for this partition.
+
+        Returns True if the stored value changed. Unknown keys are ignored,
+        invalid payloads raise ValueError or TypeError.
+        """
+        return _apply(self, _PARTITION_PARSERS, key, value)
+
+    def to_list(self) -> list[int]:
+        """
+        Return values in compact form used by snapshots.
+
+        The exit countdown is not stored as it is outdated after a restart.
+        """
+        return [
+            int(self.status),
+            int(self.ready),
+            int(self.night_mode),
+            int(self.active),
+        ]
+
+    @classmethod
+    def from_list(cls, values: list[int]) -> PartitionState:
+        """Create a stale record from values stored by to_list()."""
+        status, ready, night_mode, active = values
+        return cls(
+            status=_PARTITION_STATUSES.get(int(status), PartitionStatus.UNKNOWN),
+            ready=bool(ready),
+            night_mode=bool(night_mode),
+            active=bool(active),
+            stale=True,
+        )
+
+
+_INPUT_PARSERS: dict[str, Callable[[Any], Any]] = {
+    "status": _parse_int,
+    "block": _parse_bool,
+    "block_enable": _parse_bool,
+}
+
+_PARTITION_PARSERS: dict[str, Callable[[Any], Any]] = {
+    "status": _parse_partition_status,
+    "ready": _parse_bool,
+    "exit_time": _parse_int,
+    "night_mode": _parse_bool,
+    "active": _parse_bool,
+}
+
+
+def apply_input_value(record: Any, key: str, value: Any) -> bool:
+    """Parse and store a value published for an input record of any kind."""
+    return _apply(record, _INPUT_PARSERS, key, value)
@@ -3,16 +3,30 @@
 from __future__ import annotations
 
 import asyncio
-import ssl
+import contextlib
+import random
+import time
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable
 
 from asyncio_mqtt import Client, MqttError
 
-from .const import LOGGER
+from .const import (
+    COMMAND_QOS,
+    LOGGER,
+    MQTT_CONNECT_TIMEOUT,
+    MQTT_RECONNECT_MAX_DELAY,
+    MQTT_RECONNECT_MIN_DELAY,
+    TOPIC_ROOT,
+)
+from .message_log import PulsonMessageLog
+from .outbox import PulsonOutbox
+from .tls import async_get_ssl_context
+
+_TOPIC_PREFIX = f"{TOPIC_ROOT}/"
 
 
 @dataclass
@@ -25,23 +39,117 @@ class PulsonConfig:
     serial_number: str
     port: int = 8883
     user_code: str = "8888"
+    connect_timeout: float = MQTT_CONNECT_TIMEOUT
+    ca_certs: str | None = None
+    certfile: str | None = None
+    keyfile: str | None = None
 
 
-class PulsonMqttClient:
-    """Handler of MQTT connection."""
+def _serial_topic(serial_number: str) -> str:
+    """Return the subscription topic of all messages of a panel."""
+    return f"{_TOPIC_PREFIX}{serial_number}/#"
+
+
+class PulsonMqttConnection:
+    """
+    Single MQTT session to a broker shared by panels of one account.
+
+    The session is kept alive by a reconnect loop and subscribes to the topics
+    of every registered serial number. Received messages are routed to the
+    handler of the serial number found in the topic. Outgoing messages of all
+    panels go through one rate-limited outbox, and messages in both directions
+    are logged through one sampling message log.
+    """
 
     def __init__(self, config: PulsonConfig) -> None:
         """Set data needed to establish connection."""
         self._host = config.host
         self._username = config.username
         self._password = config.password
-        self._serial_number = config.serial_number
         self._port = config.port
-        self._user_code = config.user_code
+        self._connect_timeout = config.connect_timeout
         self._connected = False
+        self._connected_event = asyncio.Event()
+        self._ready: asyncio.Future[None] | None = None
+
+        self._ca_certs = config.ca_certs
+        self._certfile = config.certfile
+        self._keyfile = config.keyfile
+        self._client: Client | None = None
+        self._task: asyncio.Task | None = None
+        self._session: asyncio.Task | None = None
+        self._running = False
+        self._handlers: dict[str, Callable[[str, bytes], Awaitable[None]] | None] = {}
+        self._subscribed: set[str] = set()
+        self._connection_callbacks: list[Callable[[bool], None]] = []
+        self._connect_count = 0
+        self._disconnected_at: float | None = None
+        self.outbox = PulsonOutbox(self._send)
+        self.log = PulsonMessageLog()
+        self._downtime = 0.0
+        self._last_error: str | None = None
+
+    @property
+    def key(self) -> tuple[str, int, str]:
+        """Return key identifying the broker account of this connection."""
+        return (self._host, self._port, self._username)
+
+    @property
+    def password(self) -> str:
+        """Return password used by this connection."""
+        return self._password
+
+    @property
+    def connected(self) -> bool:
+        """Return True if connected and subscribed to the panel topics."""
+        return self._connected
+
+    @property
+    def serial_numbers(self) -> list[str]:
+        """Return serial numbers of panels using this connection."""
+        return list(self._handlers)
 
-        tls_context = ssl.create_default_context()
-        self._client = Client(
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return reconnect count and downtime of the connection."""
+        downtime = self._downtime
+        if self._disconnected_at is not None and self._connect_count:
+            downtime += time.monotonic() - self._disconnected_at
+        return {
+            "connected": self._connected,
+            "panels": len(self._handlers),
+            "reconnect_count": max(self._connect_count - 1, 0),
+            "downtime": round(downtime, 3),
+            "last_error": self._last_error,
+            "outbox": self.outbox.stats,
+            "traces": self.log.traces,
+        }
+
+    def register_connection_callback(
+        self, callback: Callable[[bool], None]
+    ) -> Callable[[], None]:
+        """
+        Register a callback called with the new state when connection changes.
+
+        Returns a function that removes the registration.
+        """
+        self._connection_callbacks.append(callback)
+
+        def _remove() -> None:
+            self._connection_callbacks.remove(callback)
+
+        return _remove
+
+    async def _create_client(self) -> Client:
+        """Create client for a single connection attempt."""
+        try:
+            tls_context = await async_get_ssl_context(
+                self._ca_certs, self._certfile, self._keyfile
+            )
+        except (OSError, ValueError) as err:
+            msg = f"Unable to load TLS certificates: {err}"
+            raise MqttError(msg) from err
+        return Client(
             hostname=self._host,
             port=self._port,
             username=self._username,
@@ -49,63 +157,351 @@ class PulsonMqttClient:
             tls_context=tls_context,
             keepalive=60,
         )
-        self._task = None
-        self._running = False
 
-    async def start(
-        self,
-        on_message: Callable[[str, str], Awaitable[None]] | None,
-    ) -> None:
-        """Connect to MQTT."""
+    def _set_connected(self, *, connected: bool) -> None:
+        """Update connection state, metrics and notify registered callbacks."""
+        if connected == self._connected:
+            return
+        self._connected = connected
+        now = time.monotonic()
+        if connected:
+            self._connected_event.set()
+            self._connect_count += 1
+            if self._disconnected_at is not None:
+                self._downtime += now - self._disconnected_at
+                self._disconnected_at = None
+        else:
+            self._connected_event.clear()
+            self._disconnected_at = now
+        self.outbox.set_connected(connected)
+        for cb in list(self._connection_callbacks):
+            cb(connected)
+
+    async def start(self) -> None:
+        """
+        Connect to MQTT and keep the connection alive in background.
 
-        async def _reader() -> None:
-            """Connect to MQTT."""
+        Returns as soon as the broker acknowledged the connection; calling it
+        on a running connection returns immediately. Raises MqttError if the
+        first attempt fails or does not finish within the configured timeout.
+        """
+        if self._task is None or self._task.done():
+            self._running = True
+            self._ready = asyncio.get_running_loop().create_future()
+            self._task = asyncio.create_task(self._run())
+            self.outbox.start()
+        try:
+            async with asyncio.timeout(self._connect_timeout):
+                await asyncio.shield(self._ready)
+        except TimeoutError as err:
+            await self.stop()
+            msg = f"Timed out connecting to MQTT after {self._connect_timeout} s"
+            raise MqttError(msg) from err
+        except MqttError:
+            await self.stop()
+            raise
+
+    async def _run(self) -> None:
+        """Reconnect with jittered exponential backoff until stopped."""
+        delay = MQTT_RECONNECT_MIN_DELAY
+        while self._running:
             try:
-                async with self._client.messages() as messages:
-                    try:
-                        await self._client.connect()
-                        self._connected = True
-                    except MqttError as e:
-                        LOGGER.error("Error MQTT connection: %s", e)
-                        LOGGER.error(
-                            "host: %s, port: %s, user: %s",
-                            self._host,
-                            self._port,
-                            self._username,
-                        )
-                        return
-                    await self._client.subscribe(f"system/{self._serial_number}/#")
-                    LOGGER.info("MQTT subscribed to alarm/#")
-                    async for message in messages:
-                        if isinstance(message.payload, bytes):
-                            payload = message.payload.decode()
-                        else:
-                            payload = str(message.payload)
-                        if isinstance(message.topic, bytes):
-                            topic = message.topic.decode()
-                        else:
-                            topic = str(message.topic)
-                        LOGGER.debug("MQTT received: %s -> %s", topic, payload)
-                        if on_message is not None:
-                            await on_message(topic, payload)
+                self._session = asyncio.create_task(self._connect_and_read())
+                await self._session
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if task is not None and task.cancelling():
+                    raise
+                # The session was dropped by reconnect()
+                await self._disconnect_client()
             except MqttError as err:
-                LOGGER.error("MQTT error: %s", err)
-                self._connected = True
+                self._last_error = str(err)
+                if self._ready is not None and not self._ready.done():
+                    self._ready.set_exception(err)
+                    return
+                LOGGER.warning(
+                    "MQTT connection to %s:%s lost: %s", self._host, self._port, err
+                )
+            except Exception as err:  # noqa: BLE001
+                # Never let the supervisor die while still reported connected
+                self._last_error = repr(err)
+                if self._ready is not None and not self._ready.done():
+                    self._ready.set_exception(MqttError(repr(err)))
+                    return
+                LOGGER.exception(
+                    "Unexpected error on MQTT connection to %s:%s, reconnecting",
+                    self._host,
+                    self._port,
+                )
+                await self._disconnect_client()
+            if self._connected:
+                delay = MQTT_RECONNECT_MIN_DELAY
+            self._set_connected(connected=False)
+            if not self._running:
                 return
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))  # noqa: S311
+            delay = min(delay * 2, MQTT_RECONNECT_MAX_DELAY)
+
+    async def _disconnect_client(self) -> None:
+        """Close the client of an abandoned session, ignoring errors."""
+        if self._client is not None:
+            with contextlib.suppress(MqttError):
+                await self._client.disconnect()
 
-        self._running = True
-        self._task = asyncio.create_task(_reader())
-        await asyncio.sleep(0.5)
-        if not self._connected:
-            msg = "Failed to connect to MQTT"
+    def reconnect(self, reason: str) -> None:
+        """Drop the current session so the supervisor connects again."""
+        if self._session is None or self._session.done():
+            return
+        LOGGER.warning("Reconnecting MQTT to %s:%s: %s", self._host, self._port, reason)
+        self._last_error = reason
+        self._session.cancel()
+
+    async def resubscribe(self, serial_number: str) -> None:
+        """
+        Subscribe again to the topics of a panel.
+
+        The broker then sends the retained messages of the panel again, so a
+        session that still works delivers messages soon after. Raises
+        MqttError if not connected or the subscription fails.
+        """
+        if not self._connected or self._client is None:
+            msg = "MQTT connection is down"
             raise MqttError(msg)
+        await self._client.subscribe(_serial_topic(serial_number))
+
+    async def _connect_and_read(self) -> None:
+        """Connect, subscribe to the topics of all panels and route messages."""
+        self._client = client = await self._create_client()
+        self._subscribed.clear()
+        async with client.messages() as messages:
+            await client.connect()
+            while pending := [s for s in self._handlers if s not in self._subscribed]:
+                await client.subscribe([(_serial_topic(s), 0) for s in pending])
+                self._subscribed.update(pending)
+            LOGGER.info("MQTT subscribed to %s panel(s)", len(self._subscribed))
+            self._set_connected(connected=True)
+            if self._ready is not None and not self._ready.done():
+                self._ready.set_result(None)
+            async for message in messages:
+                await self._receive(message)
+
+    async def _receive(self, message: Any) -> None:
+        """
+        Route a received message.
+
+        The payload stays bytes as received; the model parses its small
+        values directly from bytes, so it is never decoded to str. Errors
+        of a handler are logged and the message is skipped.
+        """
+        payload = message.payload
+        if not isinstance(payload, bytes):
+            payload = b"" if payload is None else str(payload).encode()
+        topic = message.topic
+        if not isinstance(topic, str):
+            topic = topic.decode() if isinstance(topic, bytes) else str(topic)
+        self.log.received(topic, payload)
+        try:
+            await self._route(topic, payload)
+        except Exception:  # noqa: BLE001
+            # A bad message must not end the session of every panel
+            LOGGER.exception("Error handling MQTT message on %s", topic)
+
+    async def _route(self, topic: str, payload: bytes) -> None:
+        """Pass a message to the handler of the panel it belongs to."""
+        if not topic.startswith(_TOPIC_PREFIX):
+            return
+        end = topic.find("/", len(_TOPIC_PREFIX))
+        serial_number = topic[len(_TOPIC_PREFIX) : end if end != -1 else None]
+        handler = self._handlers.get(serial_number)
+        if handler is not None:
+            await handler(topic, payload)
+
+    async def subscribe(
+        self,
+        serial_number: str,
+        on_message: Callable[[str, bytes], Awaitable[None]] | None,
+    ) -> None:
+        """
+        Subscribe to the topics of a panel and route its messages to a handler.
+
+        Returns once the broker acknowledged the subscription. While the
+        connection is down, waits for it up to the configured timeout.
+        """
+        self._handlers[serial_number] = on_message
+        try:
+            async with asyncio.timeout(self._connect_timeout):
+                await self._connected_event.wait()
+        except TimeoutError as err:
+            msg = f"Timed out subscribing to panel {serial_number}"
+            raise MqttError(msg) from err
+        if serial_number in self._subscribed or self._client is None:
+            return
+        await self._client.subscribe(_serial_topic(serial_number))
+        self._subscribed.add(serial_number)
+
+    async def unsubscribe(self, serial_number: str) -> None:
+        """Stop routing messages of a panel and unsubscribe from its topics."""
+        self._handlers.pop(serial_number, None)
+        if serial_number not in self._subscribed:
+            return
+        self._subscribed.discard(serial_number)
+        if self._connected and self._client is not None:
+            with contextlib.suppress(MqttError):
+                await self._client.unsubscribe(_serial_topic(serial_number))
 
     async def stop(self) -> None:
         """Disconnect MQTT."""
         self._running = False
+        await self.outbox.stop()
         if self._task:
             self._task.cancel()
-        await self._client.disconnect()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._client is not None:
+            with contextlib.suppress(MqttError):
+                await self._client.disconnect()
+        self._set_connected(connected=False)
+
+    async def _send(self, topic: str, payload: str, qos: int, retain: bool) -> None:  # noqa: FBT001
+        """Publish a message with a full topic now, raising MqttError on failure."""
+        if self._client is None:
+            msg = "MQTT connection is not started"
+            raise MqttError(msg)
+        await self._client.publish(topic, payload, qos=qos, retain=retain)
+
+
+class PulsonConnectionManager:
+    """
+    Pool of MQTT connections shared by config entries.
+
+    Panels configured with the same broker host, port and user name are
+    multiplexed over one TLS session.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty pool."""
+        self._connections: dict[tuple[str, int, str], PulsonMqttConnection] = {}
+
+    @property
+    def connections(self) -> list[PulsonMqttConnection]:
+        """Return pooled connections."""
+        return list(self._connections.values())
+
+    def acquire(self, config: PulsonConfig) -> PulsonMqttConnection:
+        """Return the pooled connection for the account, creating it if needed."""
+        key = (config.host, config.port, config.username)
+        connection = self._connections.get(key)
+        if connection is None or connection.password != config.password:
+            if connection is not None:
+                LOGGER.warning(
+                    "Panel %s uses different password for %s, not sharing connection",
+                    config.serial_number,
+                    key,
+                )
+                return PulsonMqttConnection(config)
+            connection = self._connections[key] = PulsonMqttConnection(config)
+        return connection
+
+    async def release(self, connection: PulsonMqttConnection) -> None:
+        """Close a connection no panel subscribes to anymore."""
+        if connection.serial_numbers:
+            return
+        if self._connections.get(connection.key) is connection:
+            del self._connections[connection.key]
+        await connection.stop()
+
+
+class PulsonMqttClient:
+    """Handler of MQTT connection of a single panel."""
+
+    def __init__(
+        self,
+        config: PulsonConfig,
+        manager: PulsonConnectionManager | None = None,
+    ) -> None:
+        """
+        Set data needed to establish connection.
+
+        Without a manager the client owns a dedicated connection, which is what
+        the credential test of the config flow needs.
+        """
+        self._serial_number = config.serial_number
+        self._user_code = config.user_code
+        self._manager = manager
+        self._connection = (
+            manager.acquire(config)
+            if manager is not None
+            else PulsonMqttConnection(config)
+        )
+        self._connection_callbacks: list[Callable[[bool], None]] = []
+        self._remove_connection_callback: Callable[[], None] | None = None
+
+    @property
+    def serial_number(self) -> str:
+        """Return serial number of the panel."""
+        return self._serial_number
+
+    @property
+    def connected(self) -> bool:
+        """Return True if connected and subscribed to the panel topics."""
+        return self._connection.connected
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return reconnect count and downtime of the connection."""
+        return self._connection.metrics
+
+    def register_connection_callback(self, callback: Callable[[bool], None]) -> None:
+        """Register a callback called with the new state when connection changes."""
+        self._connection_callbacks.append(callback)
+
+    async def probe(self) -> None:
+        """Ask the broker to resend the retained messages of the panel."""
+        await self._connection.resubscribe(self._serial_number)
+
+    def reconnect(self, reason: str) -> None:
+        """Reconnect the shared connection, e.g. when the session went dead."""
+        self._connection.reconnect(reason)
+
+    def _on_connection_change(self, connected: bool) -> None:  # noqa: FBT001
+        """Forward connection changes of the shared connection."""
+        for cb in self._connection_callbacks:
+            cb(connected)
+
+    async def start(
+        self,
+        on_message: Callable[[str, bytes], Awaitable[None]] | None,
+    ) -> None:
+        """
+        Connect to MQTT and subscribe to the topics of the panel.
+
+        Returns as soon as the broker acknowledged both the connection and the
+        subscription. Raises MqttError if this does not succeed within the
+        configured timeout.
+        """
+        self._remove_connection_callback = (
+            self._connection.register_connection_callback(self._on_connection_change)
+        )
+        try:
+            await self._connection.start()
+            await self._connection.subscribe(self._serial_number, on_message)
+        except MqttError:
+            await self.stop()
+            raise
+        self._on_connection_change(self._connection.connected)
+
+    async def stop(self) -> None:
+        """Unsubscribe the panel and close the connection if no longer used."""
+        if self._remove_connection_callback is not None:
+            self._remove_connection_callback()
+            self._remove_connection_callback = None
+        await self._connection.unsubscribe(self._serial_number)
+        if self._manager is not None:
+            await self._manager.release(self._connection)
+        else:
+            await self._connection.stop()
+        self._on_connection_change(False)  # noqa: FBT003
 
     async def publish(
         self, topic: str, payload: str, *, retain: bool = False, qos: int = 0
@@ -113,6 +509,9 @@ class PulsonMqttClient:
         """
         Publish a message to the MQTT broker.
 
+        The message waits in the outbox during a short disconnect and is
+        discarded if it cannot be sent before its TTL expires.
+
         Args:
             topic: Topic string to publish to.
             payload: Payload to send.
@@ -120,13 +519,12 @@ class PulsonMqttClient:
             qos: Quality of Service level (0, 1, or 2).
 
         """
-        if not self._connected:
-            LOGGER.warning("Attempted to publish while MQTT is disconnected.")
-            return
         try:
-            topic = f"system/{self._serial_number}/{topic}"
-            await self._client.publish(topic, payload, qos=qos, retain=retain)
-            LOGGER.debug("MQTT published: %s -> %s", topic, payload)
+            topic = f"{_TOPIC_PREFIX}{self._serial_number}/{topic}"
+            await self._connection.outbox.publish(
+                topic, payload, qos=qos, retain=retain
+            )
+            self._connection.log.published(topic, payload)
         except MqttError as e:
             LOGGER.error("Failed to publish MQTT message: %s", e)
 
@@ -142,6 +540,9 @@ class PulsonMqttClient:
         """
         Publish a message to the MQTT broker with authorization of code.
 
+        These are security-relevant commands, so they are sent with at least
+        QoS 1.
+
         Args:
             topic: Topic string to publish to.
             payload: Payload to send.
@@ -149,16 +550,21 @@ class PulsonMqttClient:
             qos: Quality of Service level (0, 1, or 2).
             code: code of user
 
+        Raises:
+            MqttError: The message expired or was dropped in the outbox, or
+                could not be sent, so a caller awaiting its confirmation can
+                give up at once.
+
         """
-        if not self._connected:
-            LOGGER.warning("Attempted to publish while MQTT is disconnected.")
-            return
         try:
             if code is None:
                 code = self._user_code
-            payload = f"{code}/{payload}"
-            topic = f"system/{self._serial_number}/{topic}"
-            await self._client.publish(topic, payload, qos=qos, retain=retain)
-            LOGGER.debug("MQTT published: %s -> %s", topic, payload)
+            topic = f"{_TOPIC_PREFIX}{self._serial_number}/{topic}"
+            await self._connection.outbox.publish(
+                topic, f"{code}/{payload}", qos=max(qos, COMMAND_QOS), retain=retain
+            )
+            # Never log the user code
+            self._connection.log.published(topic, payload, with_code=True)
         except MqttError as e:
             LOGGER.error("Failed to publish MQTT message: %s", e)
+            raise
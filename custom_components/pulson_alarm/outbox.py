@@ -0,0 +1,247 @@
+"""Outbound queue of MQTT publishes of a panel."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from asyncio_mqtt import MqttError
+
+from .const import (
+    COMMAND_INFLIGHT_WINDOW,
+    OUTBOX_BURST,
+    OUTBOX_RATE,
+    OUTBOX_SIZE,
+    OUTBOX_TTL,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+@dataclass(slots=True, eq=False)
+class _Outgoing:
+    """A message waiting in the queue."""
+
+    topic: str
+    payload: str
+    qos: int
+    retain: bool
+    expires: float  # event loop time
+    future: asyncio.Future[None] = field(repr=False)
+    timer: asyncio.TimerHandle | None = field(default=None, repr=False)
+    sending: bool = False
+
+
+class PulsonOutbox:
+    """
+    Bounded queue sending messages at a limited rate while connected.
+
+    Messages published during a short disconnect wait in the queue and are
+    sent after reconnecting. Each message fails when its TTL runs out before
+    it is sent, connected or not, so a stale arm command is never delivered
+    and its publisher learns about it in time. When the queue is full the
+    oldest message is dropped. A token bucket keeps the send rate within the
+    cloud allowance, and up to ``window`` publishes are in flight at once, so
+    messages waiting for PUBACK at QoS 1 do not delay the ones queued behind
+    them.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, str, int, bool], Awaitable[None]],
+        *,
+        size: int = OUTBOX_SIZE,
+        rate: float = OUTBOX_RATE,
+        burst: int = OUTBOX_BURST,
+        window: int = COMMAND_INFLIGHT_WINDOW,
+    ) -> None:
+        """Set the function sending a message and limits of the queue."""
+        self._send = send
+        self._queue: deque[_Outgoing] = deque()
+        self._size = size
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._wakeup = asyncio.Event()
+        self._connected = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._inflight = asyncio.Semaphore(window)
+        self._sending: set[asyncio.Task] = set()
+        self.queued = 0
+        self.sent = 0
+        self.expired = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth and counters of sent and discarded messages."""
+        return {
+            "depth": len(self._queue),
+            "inflight": len(self._sending),
+            "queued": self.queued,
+            "sent": self.sent,
+            "expired": self.expired,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def set_connected(self, connected: bool) -> None:  # noqa: FBT001
+        """Resume or pause sending when the connection changes."""
+        if connected:
+            self._connected.set()
+        else:
+            self._connected.clear()
+
+    def start(self) -> None:
+        """Start sending queued messages."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sending and fail all queued messages."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for task in list(self._sending):
+            task.cancel()
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
+        while self._queue:
+            self._fail(self._queue.popleft(), "Outbound queue stopped")
+
+    async def publish(
+        self,
+        topic: str,
+        payload: str,
+        *,
+        qos: int = 0,
+        retain: bool = False,
+        ttl: float = OUTBOX_TTL,
+    ) -> None:
+        """
+        Queue a message and wait until it is sent.
+
+        Raises MqttError if the message expired, was dropped from a full
+        queue or could not be sent.
+        """
+        if len(self._queue) >= self._size:
+            self.dropped += 1
+            self._fail(self._queue.popleft(), "Outbound queue full")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        item = _Outgoing(topic, payload, qos, retain, loop.time() + ttl, future)
+        item.timer = loop.call_at(item.expires, self._expire, item)
+        self._queue.append(item)
+        self.queued += 1
+        self._wakeup.set()
+        await future
+
+    async def _run(self) -> None:
+        """Start sending queued messages while connected, within the limits."""
+        while True:
+            while not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await self._connected.wait()
+            await self._inflight.acquire()
+            item = self._next_item()
+            if item is None:
+                self._inflight.release()
+                continue
+            try:
+                await self._take_token()
+            except asyncio.CancelledError:
+                self._inflight.release()
+                self._queue.appendleft(item)
+                raise
+            if item.future.done():
+                # Expired while waiting for a token
+                self._inflight.release()
+                continue
+            if not self._connected.is_set():
+                self._inflight.release()
+                self._queue.appendleft(item)
+                continue
+            item.sending = True
+            if item.timer is not None:
+                item.timer.cancel()
+                item.timer = None
+            task = asyncio.create_task(self._deliver(item))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    def _next_item(self) -> _Outgoing | None:
+        """Take the next message to send, skipping the ones already finished."""
+        while self._queue:
+            item = self._queue.popleft()
+            if item.future.done():
+                # Expired, or the publisher gave up waiting
+                continue
+            return item
+        return None
+
+    def _expire(self, item: _Outgoing) -> None:
+        """Fail a message whose TTL ran out before it was sent."""
+        item.timer = None
+        if item.sending or item.future.done():
+            return
+        with contextlib.suppress(ValueError):
+            self._queue.remove(item)
+        self.expired += 1
+        self._fail(item, f"Message to {item.topic} expired in queue")
+
+    async def _deliver(self, item: _Outgoing) -> None:
+        """Send a message and resolve its publisher, holding an inflight slot."""
+        try:
+            await self._send(item.topic, item.payload, item.qos, item.retain)
+        except asyncio.CancelledError:
+            self._fail(item, "Outbound queue stopped")
+            raise
+        except MqttError as err:
+            loop = asyncio.get_running_loop()
+            if not self._connected.is_set() and loop.time() < item.expires:
+                # Connection lost while sending, retry after reconnecting
+                item.sending = False
+                item.timer = loop.call_at(item.expires, self._expire, item)
+                self._queue.appendleft(item)
+                self._wakeup.set()
+                return
+            self.failed += 1
+            self._fail(item, str(err))
+            return
+        finally:
+            self._inflight.release()
+        self.sent += 1
+        if not item.future.done():
+            item.future.set_result(None)
+
+    async def _take_token(self) -> None:
+        """Wait until the token bucket allows sending a message."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._refilled) * self._rate
+            )
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    @staticmethod
+    def _fail(item: _Outgoing, reason: str) -> None:
+        """Fail the publish waiting for a message."""
+        if item.timer is not None:
+            item.timer.cancel()
+            item.timer = None
+        if not item.future.done():
+            item.future.set_exception(MqttError(reason))
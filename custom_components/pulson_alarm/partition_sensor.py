@@ -2,124 +2,39 @@
 Entities for representing alarm partition in Home Assistant.
 
 Includes:
-- Sensor entity for partition status (PARTITION_STATUS_MAP).
+- Sensor entity for partition status (translated PartitionStatus).
+- Sensor entity for the end of the exit time.
+- Diagnostic entities for the exit time countdown and readiness to arm.
 - Switch entity for arming/disarming
 """
 
-from enum import IntEnum
+import math
+import time
+from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
 
 from pulson_alarm.api import IntegrationPulsonAlarmApiClient
-from pulson_alarm.const import DOMAIN
 from pulson_alarm.coordinator import PulsonAlarmDataUpdateCoordinator
 
-
-class PartitionStatusInfo:
-    """Class with description and icon for partition status."""
-
-    def __init__(self, description: str, icon: str) -> None:
-        """Set description and icon."""
-        self.description = description
-        self.icon = icon
-
-    def __repr__(self) -> str:
-        """Return partition info in string."""
-        return f"PartitionStatusInfo(desc='{self.description}', icon='{self.icon}')"
-
-
-class PartitionState(IntEnum):
-    """Enumaration of partition states."""
-
-    DISARMED = 0
-    ARMED = 1
-    ARMED_NIGHT = 2
-    ENTRY_TIME = 3
-    EXIT_TIME = 4
-    ALARM_INTRUDER = 5
-    ALARM_FIRE = 6
-    ALARM_GAS = 7
-    ALARM_CO = 8
-    ALARM_MEDICAL = 9
-    ALARM_DEFINED = 10
-    ALARM_SABOTAGE_TAMPER = 11
-    ALARM_FLOOD = 12
-    ALARM_TEMPERATURE = 13
-    ENTRY_TIME_NIGHT = 14
-    EXIT_TIME_NIGHT = 15
-    ALARM_PANIC = 16
-    ALARM_HOLDUP = 17
-    ALARM_SABOTAGE_ZONE = 18
-    ALARM_IN_MEMORY = 19
-    UNKNOWN = -1
-
-
-PartitionStatusMap: dict[PartitionState, PartitionStatusInfo] = {
-    PartitionState.DISARMED: PartitionStatusInfo("Rozbrojony", "mdi:shield-off"),
-    PartitionState.ARMED: PartitionStatusInfo("Uzbrojony", "mdi:shield-check"),
-    PartitionState.ARMED_NIGHT: PartitionStatusInfo(
-        "Uzbrojony noc", "mdi:weather-night"
-    ),
-    PartitionState.ENTRY_TIME: PartitionStatusInfo("Czas wejścia", "mdi:run"),
-    PartitionState.EXIT_TIME: PartitionStatusInfo("Czas wyjścia", "mdi:exit-run"),
-    PartitionState.ALARM_INTRUDER: PartitionStatusInfo(
-        "Alarm włamaniowy", "mdi:alarm-light"
-    ),
-    PartitionState.ALARM_FIRE: PartitionStatusInfo("Alarm pożarowy", "mdi:fire-alert"),
-    PartitionState.ALARM_GAS: PartitionStatusInfo("Alarm gazowy", "mdi:gas-cylinder"),
-    PartitionState.ALARM_CO: PartitionStatusInfo("Alarm czadu", "mdi:molecule-co"),
-    PartitionState.ALARM_MEDICAL: PartitionStatusInfo(
-        "Alarm medyczny", "mdi:medical-bag"
-    ),
-    PartitionState.ALARM_DEFINED: PartitionStatusInfo(
-        "Alarm zdefiniowany", "mdi:alert-decagram"
-    ),
-    PartitionState.ALARM_SABOTAGE_TAMPER: PartitionStatusInfo(
-        "Sabotaż / manipulacja", "mdi:alert"
-    ),
-    PartitionState.ALARM_FLOOD: PartitionStatusInfo("Alarm zalania", "mdi:water"),
-    PartitionState.ALARM_TEMPERATURE: PartitionStatusInfo(
-        "Alarm temperatury", "mdi:thermometer-alert"
-    ),
-    PartitionState.ENTRY_TIME_NIGHT: PartitionStatusInfo(
-        "Czas wejścia (noc)", "mdi:run"
-    ),
-    PartitionState.EXIT_TIME_NIGHT: PartitionStatusInfo(
-        "Czas wyjścia (noc)", "mdi:exit-run"
-    ),
-    PartitionState.ALARM_PANIC: PartitionStatusInfo(
-        "Alarm paniki", "mdi:alert-octagon"
-    ),
-    PartitionState.ALARM_HOLDUP: PartitionStatusInfo("Alarm napadowy", "mdi:handcuffs"),
-    PartitionState.ALARM_SABOTAGE_ZONE: PartitionStatusInfo(
-        "Sabotaż strefy", "mdi:security"
-    ),
-    PartitionState.ALARM_IN_MEMORY: PartitionStatusInfo(
-        "Alarm w pamięci", "mdi:history"
-    ),
-    PartitionState.UNKNOWN: PartitionStatusInfo("Nieznany", "mdi:help-circle"),
-}
-
-
-def _safe_int(value: str | int | None) -> int:
-    """
-    Safely convert a value to int, or return default if conversion fails.
-
-    Handles None, invalid strings, and type errors.
-    """
-    if value is None:
-        return 0
-    try:
-        return int(value)
-    except (ValueError, TypeError):
-        return 0
+from .entity import PulsonAlarmPartitionEntity, async_run_command
+from .model import PartitionStatus
+from .status import PARTITION_STATUS_OPTIONS, resolve_partition_status
 
 
-class AlarmPartitionSensor(CoordinatorEntity, SensorEntity):
+class AlarmPartitionSensor(PulsonAlarmPartitionEntity, SensorEntity):
     """Sensor entity representing the status of an alarm partition."""
 
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = PARTITION_STATUS_OPTIONS
+    _attr_translation_key = "partition_status"
+
     def __init__(
         self,
         coordinator: PulsonAlarmDataUpdateCoordinator,
@@ -127,58 +42,153 @@ class AlarmPartitionSensor(CoordinatorEntity, SensorEntity):
         api: IntegrationPulsonAlarmApiClient,
     ) -> None:
         """Initialize Alarm Line entity."""
-        super().__init__(coordinator)
-        self._partition_id = partition_id
-        self._api = api
-        self._attr_unique_id = f"pulson_partition_status_{partition_id}"
+        super().__init__(coordinator, partition_id, api)
+        self._attr_unique_id = (
+            f"pulson_{api.serial_number}_partition_status_{partition_id}"
+        )
         self._attr_name = f"Partycja {partition_id} - Stan"
 
-    @property
-    def state(self) -> str:
-        """Return the current status label for the partition."""
-        data = self._api.partition_get_state(self._partition_id)
-        status = _safe_int(data.get("status"))
-        try:
-            state_enum = PartitionState(status)
-            return PartitionStatusMap[state_enum].description
-        except (ValueError, KeyError):
-            return PartitionStatusMap[PartitionState.UNKNOWN].description
+        self._update_attrs()
 
-    @property
-    def icon(self) -> str:
-        """Return an appropriate icon based on the partition's status."""
-        data = self._api.partition_get_state(self._partition_id)
-        status = _safe_int(data.get("status"))
-        try:
-            state_enum = PartitionState(status)
-            return PartitionStatusMap[state_enum].icon
-        except (ValueError, KeyError):
-            return PartitionStatusMap[PartitionState.UNKNOWN].icon
+    def _update_attrs(self) -> None:
+        """Resolve the status key and icon of the partition once per change."""
+        status = self._api.partition_get_state(self._partition_id).status
+        info = resolve_partition_status(status)
+        self._attr_native_value = info.key
+        self._attr_icon = info.icon
 
     @property
     def extra_state_attributes(self) -> dict:
-        """Provide basic device metadata for Home Assistant device registry."""
-        data = self._api.partition_get_state(self._partition_id)
-        return {
-            "exit_time": _safe_int(data.get("exit_time")),
-            "ready": _safe_int(data.get("ready")),
-            "night_mode": bool(_safe_int(data.get("night_mode"))),
-            "active": bool(_safe_int(data.get("active"))),
-        }
+        """
+        Return settings of the partition.
 
-    @property
-    def device_info(self) -> dict:
-        """Provide basic device metadata for Home Assistant device registry."""
+        Values changing often, such as the exit time, have entities of their
+        own so the status history is not duplicated on every change.
+        """
+        state = self._api.partition_get_state(self._partition_id)
         return {
-            "identifiers": {(DOMAIN, f"partition_{self._partition_id}")},
-            "name": f"Partycja {self._partition_id}",
-            "manufacturer": "Pulson Alarm",
-            "model": "Partycja",
-            "entry_type": "service",
+            "night_mode": state.night_mode,
+            "active": state.active,
         }
 
 
-class AlarmPartitionArmButton(CoordinatorEntity, SwitchEntity):
+class AlarmPartitionExitDeadlineSensor(PulsonAlarmPartitionEntity, SensorEntity):
+    """
+    Sensor of the time at which the exit time of an arming partition ends.
+
+    The deadline is set once per arming, so unlike the countdown it costs a
+    single state write; the frontend renders it as a relative time.
+    """
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(
+        self,
+        coordinator: PulsonAlarmDataUpdateCoordinator,
+        partition_id: str,
+        api: IntegrationPulsonAlarmApiClient,
+    ) -> None:
+        """Initialize Alarm Partition exit deadline entity."""
+        super().__init__(coordinator, partition_id, api)
+        self._attr_unique_id = (
+            f"pulson_{api.serial_number}_partition_exit_deadline_{partition_id}"
+        )
+        self._attr_name = f"Partycja {partition_id} - Koniec czasu na wyjście"
+
+        self._update_attrs()
+
+    def _update_attrs(self) -> None:
+        """Cache the exit deadline of the partition."""
+        deadline = self._api.partition_get_exit_deadline(self._partition_id)
+        self._attr_native_value = (
+            None if deadline is None else dt_util.utc_from_timestamp(deadline)
+        )
+
+
+class AlarmPartitionExitTimeSensor(PulsonAlarmPartitionEntity, SensorEntity):
+    """
+    Diagnostic sensor of the seconds left of the exit time of a partition.
+
+    The countdown is computed from the local exit deadline and ticks on a
+    timer aligned to whole seconds, as exit time messages of the panel are
+    mostly dropped. It is disabled by default to keep it out of the recorder.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(
+        self,
+        coordinator: PulsonAlarmDataUpdateCoordinator,
+        partition_id: str,
+        api: IntegrationPulsonAlarmApiClient,
+    ) -> None:
+        """Initialize Alarm Partition exit time entity."""
+        super().__init__(coordinator, partition_id, api)
+        self._attr_unique_id = (
+            f"pulson_{api.serial_number}_partition_exit_time_{partition_id}"
+        )
+        self._attr_name = f"Partycja {partition_id} - Czas na wyjście"
+        self._cancel_tick: CALLBACK_TYPE | None = None
+
+        self._update_attrs()
+
+    def _update_attrs(self) -> None:
+        """Compute the seconds left and schedule the next tick if counting."""
+        deadline = self._api.partition_get_exit_deadline(self._partition_id)
+        left = 0.0 if deadline is None else max(deadline - time.time(), 0.0)
+        self._attr_native_value = math.ceil(left)
+        if left > 0 and self.hass is not None and self._cancel_tick is None:
+            # The value changes when the time left crosses a whole second
+            self._cancel_tick = async_call_later(
+                self.hass, left - math.floor(left) or 1.0, self._async_tick
+            )
+
+    @callback
+    def _async_tick(self, _now: Any) -> None:
+        """Count down one second."""
+        self._cancel_tick = None
+        self._handle_object_update()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop counting."""
+        if self._cancel_tick is not None:
+            self._cancel_tick()
+            self._cancel_tick = None
+        await super().async_will_remove_from_hass()
+
+
+class AlarmPartitionReadySensor(PulsonAlarmPartitionEntity, BinarySensorEntity):
+    """Diagnostic binary sensor which is on when a partition is ready to arm."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:shield-check-outline"
+
+    def __init__(
+        self,
+        coordinator: PulsonAlarmDataUpdateCoordinator,
+        partition_id: str,
+        api: IntegrationPulsonAlarmApiClient,
+    ) -> None:
+        """Initialize Alarm Partition ready entity."""
+        super().__init__(coordinator, partition_id, api)
+        self._attr_unique_id = (
+            f"pulson_{api.serial_number}_partition_ready_{partition_id}"
+        )
+        self._attr_name = f"Partycja {partition_id} - Gotowa do uzbrojenia"
+
+        self._update_attrs()
+
+    def _update_attrs(self) -> None:
+        """Cache the readiness of the partition."""
+        self._attr_is_on = self._api.partition_get_state(self._partition_id).ready
+
+
+class AlarmPartitionArmButton(PulsonAlarmPartitionEntity, SwitchEntity):
     """
     Switch entity for enabling arming or disarming partition.
 
@@ -192,48 +202,37 @@ class AlarmPartitionArmButton(CoordinatorEntity, SwitchEntity):
         api: IntegrationPulsonAlarmApiClient,
     ) -> None:
         """Initialize Alarm Partition entity."""
-        super().__init__(coordinator)
-        self._partition_id = partition_id
-        self._api = api
-        self._attr_unique_id = f"pulson_partition_arm_button_{partition_id}"
+        super().__init__(coordinator, partition_id, api)
+        self._attr_unique_id = (
+            f"pulson_{api.serial_number}_partition_arm_button_{partition_id}"
+        )
         self._attr_name = f"Partycja {partition_id} - Uzbrojenie"
         self._attr_icon = "mdi:shield-lock"
 
     @property
     def is_on(self) -> bool:
         """Return True if partition is armed."""
-        data = self._api.partition_get_state(self._partition_id)
-        return _safe_int(data.get("status")) != PartitionState.DISARMED
+        status = self._api.partition_get_state(self._partition_id).status
+        return status != PartitionStatus.DISARMED
 
     @property
     def available(self) -> bool:
         """Return True if the partition can be armed."""
-        data = self._api.partition_get_state(self._partition_id)
-        return bool(_safe_int(data.get("ready")))
+        return (
+            super().available
+            and self._api.partition_get_state(self._partition_id).ready
+        )
 
     async def async_turn_on(self) -> None:
         """Send command to arm partition."""
-        await self._api.partition_arm(self._partition_id)
-        self.async_write_ha_state()
+        await async_run_command(self._api.partition_arm(self._partition_id))
 
     async def async_turn_off(self) -> None:
         """Send command to disarm partition."""
-        await self._api.partition_disarm(self._partition_id)
-        self.async_write_ha_state()
-
-    @property
-    def device_info(self) -> dict:
-        """Provide basic device metadata for Home Assistant device registry."""
-        return {
-            "identifiers": {(DOMAIN, f"partition_{self._partition_id}")},
-            "name": f"Partycja {self._partition_id}",
-            "manufacturer": "Pulson Alarm",
-            "model": "Przycisk uzbrojenia",
-            "entry_type": "service",
-        }
+        await async_run_command(self._api.partition_disarm(self._partition_id))
 
 
-class AlarmPartitionArmNightButton(CoordinatorEntity, SwitchEntity):
+class AlarmPartitionArmNightButton(PulsonAlarmPartitionEntity, SwitchEntity):
     """
     Switch entity for enabling night arming or disarming partition.
 
@@ -247,42 +246,29 @@ class AlarmPartitionArmNightButton(CoordinatorEntity, SwitchEntity):
         api: IntegrationPulsonAlarmApiClient,
     ) -> None:
         """Initialize Alarm Partition entity."""
-        super().__init__(coordinator)
-        self._partition_id = partition_id
-        self._api = api
-        self._attr_unique_id = f"pulson_partition_arm_night_button_{partition_id}"
+        super().__init__(coordinator, partition_id, api)
+        self._attr_unique_id = (
+            f"pulson_{api.serial_number}_partition_arm_night_button_{partition_id}"
+        )
         self._attr_name = f"Partycja {partition_id} - Uzbrojenie nocne"
         self._attr_icon = "mdi:shield-home"
 
     @property
     def is_on(self) -> bool:
         """Return True if partition is armed."""
-        data = self._api.partition_get_state(self._partition_id)
-        return bool(_safe_int(data.get("status")) == PartitionState.ARMED_NIGHT)
+        status = self._api.partition_get_state(self._partition_id).status
+        return status == PartitionStatus.ARMED_NIGHT
 
     @property
     def available(self) -> bool:
         """Return True if the partition can be armed."""
-        data = self._api.partition_get_state(self._partition_id)
-        return bool(_safe_int(data.get("ready"))) and data.get("night_mode") == "true"
+        state = self._api.partition_get_state(self._partition_id)
+        return super().available and state.ready and state.night_mode
 
     async def async_turn_on(self) -> None:
         """Send command to arm partition."""
-        await self._api.partition_arm_night(self._partition_id)
-        self.async_write_ha_state()
+        await async_run_command(self._api.partition_arm_night(self._partition_id))
 
     async def async_turn_off(self) -> None:
         """Send command to disarm partition."""
-        await self._api.partition_disarm(self._partition_id)
-        self.async_write_ha_state()
-
-    @property
-    def device_info(self) -> dict:
-        """Provide basic device metadata for Home Assistant device registry."""
-        return {
-            "identifiers": {(DOMAIN, f"partition_{self._partition_id}")},
-            "name": f"Partycja {self._partition_id}",
-            "manufacturer": "Pulson Alarm",
-            "model": "Przycisk uzbrojenia nocnego",
-            "entry_type": "service",
-        }
+        await async_run_command(self._api.partition_disarm(self._partition_id))
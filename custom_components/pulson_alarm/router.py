@@ -0,0 +1,130 @@
+"""Routing of Pulson cloud MQTT topics to module handlers."""
+
+from __future__ import annotations
+
+import sys
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+from .const import (
+    CLOUD_TOPIC_ACTION_INDEX,
+    CLOUD_TOPIC_MODULE_INDEX,
+    CLOUD_TOPIC_NUMBER_INDEX,
+    CLOUD_TOPIC_SUBTYPE_INDEX,
+    CLOUD_TOPIC_SYSTEM_INDEX,
+    CLOUD_TOPIC_SYSTEMID_INDEX,
+    LOGGER,
+    TOPIC_CACHE_SIZE,
+    TOPIC_ROOT,
+)
+from .metrics import STAGE_MODEL, STAGE_PARSE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .metrics import PulsonIngestMetrics
+
+
+class PulsonTopic(NamedTuple):
+    """Parsed topic in form system/<serial>/<module>/<number>/<action>[/<subtype>]."""
+
+    serial: str
+    module: str
+    number: str
+    action: str
+    subtype: str | None
+
+
+@lru_cache(maxsize=TOPIC_CACHE_SIZE)
+def parse_topic(topic: str) -> PulsonTopic | None:
+    """
+    Split a topic into its segments, or return None if it is not a Pulson one.
+
+    The set of topics published by a panel is small and fixed, so results are
+    cached and segments are interned to make later comparisons cheap.
+    """
+    parts = topic.split("/")
+    if (
+        len(parts) <= CLOUD_TOPIC_ACTION_INDEX
+        or parts[CLOUD_TOPIC_SYSTEM_INDEX] != TOPIC_ROOT
+    ):
+        return None
+    return PulsonTopic(
+        serial=sys.intern(parts[CLOUD_TOPIC_SYSTEMID_INDEX]),
+        module=sys.intern(parts[CLOUD_TOPIC_MODULE_INDEX]),
+        number=sys.intern(parts[CLOUD_TOPIC_NUMBER_INDEX]),
+        action=sys.intern(parts[CLOUD_TOPIC_ACTION_INDEX]),
+        subtype=(
+            sys.intern(parts[CLOUD_TOPIC_SUBTYPE_INDEX])
+            if len(parts) > CLOUD_TOPIC_SUBTYPE_INDEX
+            else None
+        ),
+    )
+
+
+class PulsonTopicRouter:
+    """Dispatch MQTT messages to handlers registered per topic module."""
+
+    def __init__(self, metrics: PulsonIngestMetrics | None = None) -> None:
+        """Initialize an empty dispatch table, optionally timing each stage."""
+        self._metrics = metrics
+        self._handlers: dict[str, Callable[[PulsonTopic, bytes], None]] = {}
+        self.routed = 0
+        self.unrouted = 0
+        self.failed = 0
+
+    def register(
+        self, module: str, handler: Callable[[PulsonTopic, bytes], None]
+    ) -> None:
+        """Register a handler for messages of a module (e.g. inputs)."""
+        self._handlers[sys.intern(module)] = handler
+
+    @property
+    def messages(self) -> int:
+        """Return the number of all messages passed to route()."""
+        return self.routed + self.unrouted + self.failed
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return counters of routed and dropped messages."""
+        return {
+            "routed": self.routed,
+            "unrouted": self.unrouted,
+            "failed": self.failed,
+        }
+
+    def route(self, topic: str, payload: bytes) -> bool:
+        """
+        Pass a message to the handler of its module.
+
+        Returns True if a handler accepted the message. Empty payloads,
+        unknown topics and modules without a handler are dropped.
+        """
+        if not payload:
+            self.unrouted += 1
+            return False
+        metrics = self._metrics
+        if metrics is None:
+            return self._dispatch(parse_topic(topic), payload)
+        start = metrics.clock()
+        parsed = parse_topic(topic)
+        parsed_at = metrics.clock()
+        metrics.record(STAGE_PARSE, parsed_at - start)
+        routed = self._dispatch(parsed, payload)
+        metrics.record(STAGE_MODEL, metrics.clock() - parsed_at)
+        return routed
+
+    def _dispatch(self, parsed: PulsonTopic | None, payload: bytes) -> bool:
+        """Call the handler of a parsed topic and count the outcome."""
+        handler = None if parsed is None else self._handlers.get(parsed.module)
+        if parsed is None or handler is None:
+            self.unrouted += 1
+            return False
+        try:
+            handler(parsed, payload)
+        except (ValueError, TypeError) as e:
+            self.failed += 1
+            LOGGER.warning("Problem with parsing %s state: %s", parsed.module, e)
+            return False
+        self.routed += 1
+        return True
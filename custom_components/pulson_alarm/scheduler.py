@@ -0,0 +1,153 @@
+"""Coalescing scheduler for entity state writes triggered by MQTT messages."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .const import DEFAULT_UPDATE_MAX_LATENCY, DEFAULT_UPDATE_WINDOW
+from .metrics import STAGE_DISPATCH, STAGE_INGEST, STAGE_WRITE
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable, Hashable, Sequence
+
+    from .metrics import PulsonIngestMetrics
+
+
+class PulsonUpdateScheduler:
+    """
+    Collect dirty objects and flush their update callbacks in one batch.
+
+    Every mark postpones the flush by ``window`` seconds (a window of 0 means
+    the next event-loop iteration), but never further than ``max_latency``
+    seconds after the first pending mark. Urgent marks, such as alarm
+    transitions, flush on the next loop iteration.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        window: float = DEFAULT_UPDATE_WINDOW,
+        max_latency: float = DEFAULT_UPDATE_MAX_LATENCY,
+        metrics: PulsonIngestMetrics | None = None,
+    ) -> None:
+        """Set timing of the scheduler."""
+        self._loop = loop
+        self._metrics = metrics
+        self._marked_at: dict[Hashable, float] = {}
+        self._window = max(window, 0.0)
+        self._max_latency = max(max_latency, self._window)
+        self._dirty: dict[Hashable, Sequence[Callable[[], None]]] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self._first_mark = 0.0
+        self._last_mark = 0.0
+        self._urgent = False
+        self.messages_received = 0
+        self.marks = 0
+        self.flushes = 0
+        self.callbacks_run = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return counters of the scheduler."""
+        return {
+            "window": self._window,
+            "max_latency": self._max_latency,
+            "messages_received": self.messages_received,
+            "marks": self.marks,
+            "flushes": self.flushes,
+            "callbacks_run": self.callbacks_run,
+            "pending": len(self._dirty),
+        }
+
+    def message_received(self) -> None:
+        """Count a message that reached the data model."""
+        self.messages_received += 1
+
+    def mark_dirty(
+        self,
+        key: Hashable,
+        callbacks: Sequence[Callable[[], None]],
+        *,
+        urgent: bool = False,
+    ) -> None:
+        """
+        Schedule callbacks of a changed object to be called on the next flush.
+
+        Marking the same key several times before a flush results in a single
+        call of each of its callbacks.
+        """
+        self.marks += 1
+        self._dirty[key] = callbacks
+        now = self._loop.time()
+        self._last_mark = now
+        if self._metrics is not None and key not in self._marked_at:
+            self._marked_at[key] = now
+        if urgent:
+            self._urgent = True
+            if self._handle is not None:
+                if self._handle.when() <= now:
+                    return
+                self._handle.cancel()
+            self._handle = self._loop.call_at(now, self._on_timer)
+            return
+        if self._handle is None:
+            self._first_mark = now
+            self._handle = self._loop.call_at(now + self._window, self._on_timer)
+
+    def _on_timer(self) -> None:
+        """Flush pending updates, or wait longer while a burst goes on."""
+        self._handle = None
+        if not self._urgent:
+            when = min(
+                self._last_mark + self._window,
+                self._first_mark + self._max_latency,
+            )
+            if when > self._loop.time():
+                self._handle = self._loop.call_at(when, self._on_timer)
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Call callbacks of all dirty objects now."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._urgent = False
+        dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        self.flushes += 1
+        if self._metrics is not None:
+            self._flush_timed(self._metrics, dirty)
+            return
+        for callbacks in dirty.values():
+            for cb in callbacks:
+                cb()
+                self.callbacks_run += 1
+
+    def _flush_timed(
+        self,
+        metrics: PulsonIngestMetrics,
+        dirty: dict[Hashable, Sequence[Callable[[], None]]],
+    ) -> None:
+        """Call callbacks of dirty objects recording dispatch and write times."""
+        marked_at, self._marked_at = self._marked_at, {}
+        flushed = self._loop.time()
+        for key, callbacks in dirty.items():
+            first_mark = marked_at.get(key, flushed)
+            metrics.record(STAGE_DISPATCH, flushed - first_mark)
+            for cb in callbacks:
+                start = metrics.clock()
+                cb()
+                metrics.record(STAGE_WRITE, metrics.clock() - start)
+                self.callbacks_run += 1
+            metrics.record(STAGE_INGEST, self._loop.time() - first_mark)
+
+    def stop(self) -> None:
+        """Cancel the pending flush and forget dirty objects."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._dirty.clear()
+        self._marked_at.clear()
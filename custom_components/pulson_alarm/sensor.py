@@ -12,7 +12,12 @@ from .coordinator import PulsonAlarmDataUpdateCoordinator
 from .line_sensor import (
     AlarmLineStatusSensor,
 )
-from .partition_sensor import AlarmPartitionSensor
+from .metrics_sensor import METRICS_SENSORS, PulsonMetricsSensor
+from .partition_sensor import (
+    AlarmPartitionExitDeadlineSensor,
+    AlarmPartitionExitTimeSensor,
+    AlarmPartitionSensor,
+)
 
 
 def create_input_entity_adder(
@@ -23,15 +28,19 @@ def create_input_entity_adder(
     """Create a function that adds new input entities dynamically."""
     registered_status: dict[str, AlarmLineStatusSensor] = {}
 
-    def add_input_entity(input_id: str) -> None:
-        if input_id in registered_status:
-            return  # already added
+    def add_input_entity(*input_ids: str) -> None:
+        entities = []
+        for input_id in input_ids:
+            if input_id in registered_status:
+                continue  # already added
 
-        status_entity = AlarmLineStatusSensor(coordinator, input_id, api)
+            status_entity = AlarmLineStatusSensor(coordinator, input_id, api)
 
-        registered_status[input_id] = status_entity
+            registered_status[input_id] = status_entity
+            entities.append(status_entity)
 
-        async_add_entities([status_entity])
+        if entities:
+            async_add_entities(entities)
 
     return add_input_entity
 
@@ -44,15 +53,25 @@ def create_partition_entity_adder(
     """Create a function that adds new partition entities dynamically."""
     registered_partitions: dict[str, AlarmPartitionSensor] = {}
 
-    def add_partition_entity(partition_id: str) -> None:
-        if partition_id in registered_partitions:
-            return
+    def add_partition_entity(*partition_ids: str) -> None:
+        entities = []
+        for partition_id in partition_ids:
+            if partition_id in registered_partitions:
+                continue
 
-        sensor = AlarmPartitionSensor(coordinator, partition_id, api)
+            sensor = AlarmPartitionSensor(coordinator, partition_id, api)
 
-        registered_partitions[partition_id] = sensor
+            registered_partitions[partition_id] = sensor
+            entities.append(sensor)
+            entities.append(
+                AlarmPartitionExitDeadlineSensor(coordinator, partition_id, api)
+            )
+            entities.append(
+                AlarmPartitionExitTimeSensor(coordinator, partition_id, api)
+            )
 
-        async_add_entities([sensor])
+        if entities:
+            async_add_entities(entities)
 
     return add_partition_entity
 
@@ -69,16 +88,22 @@ async def async_setup_entry(
 
     # Register callback for dynamic entity creation
     add_input_entity = create_input_entity_adder(coordinator, api, async_add_entities)
-    api.input_register_added_callback(add_input_entity)
+    discovery = entry.runtime_data.discovery
+    api.input_register_added_callback(discovery.wrap(add_input_entity))
 
     # Register callback for dynamic partition entity creation
     add_partition_entity = create_partition_entity_adder(
         coordinator, api, async_add_entities
     )
-    api.partition_register_added_callback(add_partition_entity)
-
-    # Add already known entities
-    for input_id in api.input_get_all_ids():
-        add_input_entity(input_id)
-    for partition_id in api.partition_get_all_ids():
-        add_partition_entity(partition_id)
+    api.partition_register_added_callback(discovery.wrap(add_partition_entity))
+
+    # Add already known entities, e.g. restored from snapshot, in one batch
+    add_input_entity(*api.input_get_all_ids())
+    add_partition_entity(*api.partition_get_all_ids())
+
+    # Diagnostic sensors of the ingest pipeline, only when timing is enabled
+    if entry.runtime_data.metrics is not None:
+        async_add_entities(
+            PulsonMetricsSensor(entry.runtime_data, description)
+            for description in METRICS_SENSORS
+        )
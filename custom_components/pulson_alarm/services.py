@@ -0,0 +1,213 @@
+"""Services acting on many partitions or lines of a panel at once, and tracing."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DATA_CONNECTION_MANAGER, DOMAIN, TOPIC_ROOT
+
+if TYPE_CHECKING:
+    from .api import IntegrationPulsonAlarmApiClient
+    from .mqtt_client import PulsonConnectionManager
+
+SERVICE_ARM_PARTITIONS = "arm_partitions"
+SERVICE_DISARM_PARTITIONS = "disarm_partitions"
+SERVICE_BLOCK_LINES = "block_lines"
+SERVICE_TRACE = "trace"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_PARTITIONS = "partitions"
+ATTR_LINES = "lines"
+ATTR_MODE = "mode"
+ATTR_BLOCK = "block"
+ATTR_CODE = "code"
+ATTR_SERIAL_NUMBER = "serial_number"
+ATTR_TOPIC_PREFIX = "topic_prefix"
+ATTR_DURATION = "duration"
+
+MODE_AWAY = "away"
+MODE_NIGHT = "night"
+
+_IDS = vol.All(cv.ensure_list, [cv.string], vol.Length(min=1))
+
+_BASE_SCHEMA = {
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_CODE): cv.string,
+}
+
+ARM_PARTITIONS_SCHEMA = vol.Schema(
+    {
+        **_BASE_SCHEMA,
+        vol.Required(ATTR_PARTITIONS): _IDS,
+        vol.Optional(ATTR_MODE, default=MODE_AWAY): vol.In([MODE_AWAY, MODE_NIGHT]),
+    }
+)
+DISARM_PARTITIONS_SCHEMA = vol.Schema(
+    {
+        **_BASE_SCHEMA,
+        vol.Required(ATTR_PARTITIONS): _IDS,
+    }
+)
+BLOCK_LINES_SCHEMA = vol.Schema(
+    {
+        **_BASE_SCHEMA,
+        vol.Required(ATTR_LINES): _IDS,
+        vol.Optional(ATTR_BLOCK, default=True): cv.boolean,
+    }
+)
+TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SERIAL_NUMBER): cv.string,
+        vol.Optional(ATTR_TOPIC_PREFIX, default=""): cv.string,
+        vol.Optional(ATTR_DURATION, default=300): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=86400)
+        ),
+    }
+)
+
+
+def _get_api(hass: HomeAssistant, call: ServiceCall) -> IntegrationPulsonAlarmApiClient:
+    """Return the API client of the panel a service call targets."""
+    entries = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id is not None:
+        entries = [entry for entry in entries if entry.entry_id == entry_id]
+    if len(entries) != 1:
+        msg = (
+            f"No loaded panel with config entry {entry_id}"
+            if entry_id is not None
+            else "Several panels are loaded, set config_entry_id"
+        )
+        raise ServiceValidationError(msg)
+    return entries[0].runtime_data.api_client
+
+
+def _response(results: dict[str, dict[str, Any]]) -> ServiceResponse:
+    """Return per-id results and whether all commands were confirmed."""
+    return {
+        "success": all(result["success"] for result in results.values()),
+        "results": results,
+    }
+
+
+async def _async_arm_partitions(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Arm partitions concurrently and wait for their confirmations."""
+    api = _get_api(hass, call)
+    code = call.data.get(ATTR_CODE)
+    arm = (
+        api.partition_arm_night
+        if call.data[ATTR_MODE] == MODE_NIGHT
+        else api.partition_arm
+    )
+    return _response(
+        await api.execute_many(
+            {pid: arm(pid, code) for pid in dict.fromkeys(call.data[ATTR_PARTITIONS])}
+        )
+    )
+
+
+async def _async_disarm_partitions(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Disarm partitions concurrently and wait for their confirmations."""
+    api = _get_api(hass, call)
+    code = call.data.get(ATTR_CODE)
+    return _response(
+        await api.execute_many(
+            {
+                pid: api.partition_disarm(pid, code)
+                for pid in dict.fromkeys(call.data[ATTR_PARTITIONS])
+            }
+        )
+    )
+
+
+async def _async_block_lines(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Block or unblock lines concurrently and wait for their confirmations."""
+    api = _get_api(hass, call)
+    code = call.data.get(ATTR_CODE)
+    block = call.data[ATTR_BLOCK]
+    return _response(
+        await api.execute_many(
+            {
+                line_id: api.set_input_block_state(line_id, block=block, code=code)
+                for line_id in dict.fromkeys(call.data[ATTR_LINES])
+            }
+        )
+    )
+
+
+async def _async_trace(hass: HomeAssistant, call: ServiceCall) -> None:
+    """
+    Log all messages of a panel or topic prefix for some time.
+
+    The prefix is relative to the topics of the panel when a serial number
+    is given, otherwise it is a full topic prefix. Duration 0 stops tracing.
+    """
+    manager: PulsonConnectionManager | None = hass.data.get(DATA_CONNECTION_MANAGER)
+    connections = [] if manager is None else manager.connections
+    if not connections:
+        msg = "No panel is connected"
+        raise ServiceValidationError(msg)
+    prefix = call.data[ATTR_TOPIC_PREFIX]
+    serial_number = call.data.get(ATTR_SERIAL_NUMBER)
+    if serial_number is not None:
+        prefix = f"{TOPIC_ROOT}/{serial_number}/{prefix}"
+    for connection in connections:
+        connection.log.trace(prefix, call.data[ATTR_DURATION])
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def arm_partitions(call: ServiceCall) -> ServiceResponse:
+        return await _async_arm_partitions(hass, call)
+
+    async def disarm_partitions(call: ServiceCall) -> ServiceResponse:
+        return await _async_disarm_partitions(hass, call)
+
+    async def block_lines(call: ServiceCall) -> ServiceResponse:
+        return await _async_block_lines(hass, call)
+
+    async def trace(call: ServiceCall) -> None:
+        await _async_trace(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ARM_PARTITIONS,
+        arm_partitions,
+        schema=ARM_PARTITIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DISARM_PARTITIONS,
+        disarm_partitions,
+        schema=DISARM_PARTITIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BLOCK_LINES,
+        block_lines,
+        schema=BLOCK_LINES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_TRACE, trace, schema=TRACE_SCHEMA)
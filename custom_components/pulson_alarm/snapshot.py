@@ -0,0 +1,97 @@
+"""Persistence of the inputs and partitions model between restarts."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER, SNAPSHOT_SAVE_INTERVAL, SNAPSHOT_STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, HomeAssistant
+
+    from .api import IntegrationPulsonAlarmApiClient
+    from .data import IntegrationPulsonAlarmConfigEntry
+
+
+def _create_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return storage of the snapshot of a config entry."""
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the saved model of a removed config entry."""
+    await _create_store(hass, entry_id).async_remove()
+
+
+class PulsonSnapshotStore:
+    """
+    Save the API client model to HA storage and restore it on setup.
+
+    The model is saved periodically when it changed, on Home Assistant stop
+    and when the config entry is unloaded.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: IntegrationPulsonAlarmConfigEntry,
+        api_client: IntegrationPulsonAlarmApiClient,
+    ) -> None:
+        """Initialize storage of a config entry."""
+        self._hass = hass
+        self._entry = entry
+        self._api = api_client
+        self._store = _create_store(hass, entry.entry_id)
+        self._saved_version: int | None = None
+
+    async def async_restore(self) -> None:
+        """Load the saved model into the API client."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        try:
+            self._api.restore(data)
+        except (KeyError, TypeError, ValueError) as err:
+            LOGGER.warning(
+                "Ignoring invalid snapshot of %s: %s", self._entry.title, err
+            )
+            return
+        self._saved_version = self._api.version
+        LOGGER.debug(
+            "Restored %s inputs and %s partitions",
+            len(data.get("inputs", {})),
+            len(data.get("partitions", {})),
+        )
+
+    def async_setup(self) -> None:
+        """Start periodic saving and save on Home Assistant stop."""
+        self._entry.async_on_unload(
+            async_track_time_interval(
+                self._hass, self._async_save_interval, SNAPSHOT_SAVE_INTERVAL
+            )
+        )
+        self._entry.async_on_unload(
+            self._hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STOP, self._async_save_on_stop
+            )
+        )
+
+    async def async_save(self) -> None:
+        """Save the model if it changed since the last save."""
+        version = self._api.version
+        if version == self._saved_version:
+            return
+        await self._store.async_save(self._api.snapshot())
+        self._saved_version = version
+
+    async def _async_save_interval(self, _now: Any) -> None:
+        """Save the model periodically."""
+        await self.async_save()
+
+    async def _async_save_on_stop(self, _event: Event) -> None:
+        """Save the model when Home Assistant stops."""
+        await self.async_save()
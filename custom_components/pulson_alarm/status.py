@@ -0,0 +1,94 @@
+"""Lookup tables translating line and partition status codes for entities."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from homeassistant.components.alarm_control_panel.const import AlarmControlPanelState
+
+from .model import InputStatus, PartitionStatus
+
+
+class StatusInfo(NamedTuple):
+    """Presentation of a status code: translation key, icon and alarm state."""
+
+    key: str
+    icon: str
+    alarm_state: AlarmControlPanelState | None = None
+
+
+LINE_STATUSES: dict[int, StatusInfo] = {
+    InputStatus.UNKNOWN: StatusInfo("unknown", "mdi:help-circle"),
+    InputStatus.CLOSED: StatusInfo("closed", "mdi:lock"),
+    InputStatus.OPEN: StatusInfo("open", "mdi:lock-open"),
+    InputStatus.TAMPER: StatusInfo("tamper", "mdi:alert"),
+    InputStatus.FAULT: StatusInfo("fault", "mdi:alert-octagon"),
+}
+
+_DISARMED = AlarmControlPanelState.DISARMED
+_PENDING = AlarmControlPanelState.PENDING
+_ARMING = AlarmControlPanelState.ARMING
+_TRIGGERED = AlarmControlPanelState.TRIGGERED
+
+PARTITION_STATUSES: dict[PartitionStatus, StatusInfo] = {
+    PartitionStatus.DISARMED: StatusInfo("disarmed", "mdi:shield-off", _DISARMED),
+    PartitionStatus.ARMED: StatusInfo(
+        "armed", "mdi:shield-check", AlarmControlPanelState.ARMED_AWAY
+    ),
+    PartitionStatus.ARMED_NIGHT: StatusInfo(
+        "armed_night", "mdi:weather-night", AlarmControlPanelState.ARMED_NIGHT
+    ),
+    PartitionStatus.ENTRY_TIME: StatusInfo("entry_time", "mdi:run", _PENDING),
+    PartitionStatus.EXIT_TIME: StatusInfo("exit_time", "mdi:exit-run", _ARMING),
+    PartitionStatus.ALARM_INTRUDER: StatusInfo(
+        "alarm_intruder", "mdi:alarm-light", _TRIGGERED
+    ),
+    PartitionStatus.ALARM_FIRE: StatusInfo("alarm_fire", "mdi:fire-alert", _TRIGGERED),
+    PartitionStatus.ALARM_GAS: StatusInfo("alarm_gas", "mdi:gas-cylinder", _TRIGGERED),
+    PartitionStatus.ALARM_CO: StatusInfo("alarm_co", "mdi:molecule-co", _TRIGGERED),
+    PartitionStatus.ALARM_MEDICAL: StatusInfo(
+        "alarm_medical", "mdi:medical-bag", _TRIGGERED
+    ),
+    PartitionStatus.ALARM_DEFINED: StatusInfo(
+        "alarm_defined", "mdi:alert-decagram", _TRIGGERED
+    ),
+    PartitionStatus.ALARM_SABOTAGE_TAMPER: StatusInfo(
+        "alarm_sabotage_tamper", "mdi:alert", _TRIGGERED
+    ),
+    PartitionStatus.ALARM_FLOOD: StatusInfo("alarm_flood", "mdi:water", _TRIGGERED),
+    PartitionStatus.ALARM_TEMPERATURE: StatusInfo(
+        "alarm_temperature", "mdi:thermometer-alert", _TRIGGERED
+    ),
+    PartitionStatus.ENTRY_TIME_NIGHT: StatusInfo(
+        "entry_time_night", "mdi:run", _PENDING
+    ),
+    PartitionStatus.EXIT_TIME_NIGHT: StatusInfo(
+        "exit_time_night", "mdi:exit-run", _ARMING
+    ),
+    PartitionStatus.ALARM_PANIC: StatusInfo(
+        "alarm_panic", "mdi:alert-octagon", _TRIGGERED
+    ),
+    PartitionStatus.ALARM_HOLDUP: StatusInfo(
+        "alarm_holdup", "mdi:handcuffs", _TRIGGERED
+    ),
+    PartitionStatus.ALARM_SABOTAGE_ZONE: StatusInfo(
+        "alarm_sabotage_zone", "mdi:security", _TRIGGERED
+    ),
+    PartitionStatus.ALARM_IN_MEMORY: StatusInfo(
+        "alarm_in_memory", "mdi:history", _PENDING
+    ),
+    PartitionStatus.UNKNOWN: StatusInfo("unknown", "mdi:help-circle"),
+}
+
+LINE_STATUS_OPTIONS = [info.key for info in LINE_STATUSES.values()]
+PARTITION_STATUS_OPTIONS = [info.key for info in PARTITION_STATUSES.values()]
+
+
+def resolve_line_status(status: int) -> StatusInfo:
+    """Return presentation of a line status code."""
+    return LINE_STATUSES.get(status, LINE_STATUSES[InputStatus.UNKNOWN])
+
+
+def resolve_partition_status(status: PartitionStatus) -> StatusInfo:
+    """Return presentation of a partition status."""
+    return PARTITION_STATUSES[status]
@@ -0,0 +1,178 @@
+"""Columnar store of input states for installations with many lines."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .const import COLUMN_STORE_MAX_INPUTS
+from .model import apply_input_value
+
+_STATUS_MIN = -(2**31)
+_STATUS_MAX = 2**31 - 1
+
+
+class InputColumnRecord:
+    """
+    View of one input in the columns, used like an InputState record.
+
+    Reading or assigning a field reads or writes its column, so the view
+    holds no state besides the store and the slot of the input.
+    """
+
+    __slots__ = ("_slot", "_store")
+
+    def __init__(self, store: InputColumnStore, slot: int) -> None:
+        """Bind the view to a slot of the store."""
+        self._store = store
+        self._slot = slot
+
+    @property
+    def status(self) -> int:
+        """Return the status code of the line."""
+        return self._store.status[self._slot]
+
+    @status.setter
+    def status(self, value: int) -> None:
+        if not _STATUS_MIN <= value <= _STATUS_MAX:
+            msg = f"Input status out of range: {value}"
+            raise ValueError(msg)
+        self._store.status[self._slot] = value
+
+    @property
+    def block(self) -> bool:
+        """Return True if the line is blocked."""
+        return bool(self._store.block[self._slot])
+
+    @block.setter
+    def block(self, value: bool) -> None:
+        self._store.block[self._slot] = value
+
+    @property
+    def block_enable(self) -> bool:
+        """Return True if the line may be blocked."""
+        return bool(self._store.block_enable[self._slot])
+
+    @block_enable.setter
+    def block_enable(self, value: bool) -> None:
+        self._store.block_enable[self._slot] = value
+
+    @property
+    def stale(self) -> bool:
+        """Return True while the values are restored and not confirmed yet."""
+        return bool(self._store.stale[self._slot])
+
+    @stale.setter
+    def stale(self, value: bool) -> None:
+        self._store.stale[self._slot] = value
+
+    @property
+    def version(self) -> int:
+        """Return how many times a value of the line changed."""
+        return self._store.version[self._slot]
+
+    @version.setter
+    def version(self, value: int) -> None:
+        self._store.version[self._slot] = value
+
+    def apply(self, key: str, value: Any) -> bool:
+        """
+        Parse and store a value published for this input.
+
+        Returns True if the stored value changed. Unknown keys are ignored,
+        invalid payloads raise ValueError or TypeError.
+        """
+        return apply_input_value(self, key, value)
+
+    def to_list(self) -> list[int]:
+        """Return values in compact form used by snapshots."""
+        return [self.status, int(self.block), int(self.block_enable)]
+
+
+class InputColumnStore(Mapping[str, InputColumnRecord]):
+    """
+    Keep input states in columns instead of one record object per line.
+
+    Lines get consecutive slots in the order they are first seen, so the
+    columns stay dense whatever the ids look like, and the ids are kept as
+    published. Status and version are machine integers and the flags are
+    bytes, which for hundreds of lines per panel takes a fraction of the
+    memory of records, and exports of all lines read whole columns. At most
+    ``max_inputs`` lines are stored; more raise ValueError.
+    """
+
+    def __init__(self, max_inputs: int = COLUMN_STORE_MAX_INPUTS) -> None:
+        """Initialize empty columns."""
+        self._max_inputs = max_inputs
+        self._slots: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._records: list[InputColumnRecord] = []
+        self.status = array("i")
+        self.version = array("Q")
+        self.block = bytearray()
+        self.block_enable = bytearray()
+        self.stale = bytearray()
+
+    def __len__(self) -> int:
+        """Return number of known inputs."""
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over ids of known inputs in the order they were added."""
+        return iter(self._ids)
+
+    def __contains__(self, input_id: object) -> bool:
+        """Return True if the input is known."""
+        return input_id in self._slots
+
+    def __getitem__(self, input_id: str) -> InputColumnRecord:
+        """Return the record view of an input."""
+        return self._records[self._slots[input_id]]
+
+    def get(self, input_id: str, default: Any = None) -> Any:
+        """Return the record view of an input, or default if unknown."""
+        slot = self._slots.get(input_id)
+        return default if slot is None else self._records[slot]
+
+    def add(self, input_id: str, values: list[int] | None = None) -> InputColumnRecord:
+        """
+        Add an input and return its record view.
+
+        Values stored by to_list() are loaded as stale, until a live value
+        confirms them. Raises ValueError if the store is full.
+        """
+        if input_id in self._slots:
+            return self[input_id]
+        if len(self._ids) >= self._max_inputs:
+            msg = f"Column store is full, ignoring input {input_id!r}"
+            raise ValueError(msg)
+        status, block, block_enable = values or (0, 0, 0)
+        status = int(status)
+        if not _STATUS_MIN <= status <= _STATUS_MAX:
+            msg = f"Input status out of range: {status}"
+            raise ValueError(msg)
+        slot = len(self._ids)
+        self._slots[input_id] = slot
+        self._ids.append(input_id)
+        self.status.append(status)
+        self.version.append(0)
+        self.block.append(bool(block))
+        self.block_enable.append(bool(block_enable))
+        self.stale.append(values is not None)
+        record = InputColumnRecord(self, slot)
+        self._records.append(record)
+        return record
+
+    def to_lists(self) -> dict[str, list[int]]:
+        """Return values of all inputs in the compact form of to_list()."""
+        return {
+            input_id: [status, block, block_enable]
+            for input_id, status, block, block_enable in zip(
+                self._ids,
+                self.status,
+                self.block,
+                self.block_enable,
+                strict=True,
+            )
+        }
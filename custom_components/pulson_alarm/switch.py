@@ -25,13 +25,18 @@ def create_input_switch_adder(
     """Create a function that adds new switch entities for block control dynamically."""
     registered: dict[str, AlarmLineBlockSwitch] = {}
 
-    def add_input_switch(input_id: str) -> None:
-        if input_id in registered:
-            return
+    def add_input_switch(*input_ids: str) -> None:
+        entities = []
+        for input_id in input_ids:
+            if input_id in registered:
+                continue
 
-        switch_entity = AlarmLineBlockSwitch(coordinator, input_id, api)
-        registered[input_id] = switch_entity
-        async_add_entities([switch_entity])
+            switch_entity = AlarmLineBlockSwitch(coordinator, input_id, api)
+            registered[input_id] = switch_entity
+            entities.append(switch_entity)
+
+        if entities:
+            async_add_entities(entities)
 
     return add_input_switch
 
@@ -44,15 +49,16 @@ def create_partition_switch_adder(
     """Create a function that adds new switch entities of partition."""
     registered: dict[str, list] = {}
 
-    def add_partition_switch(partition_id: str) -> None:
-        if partition_id in registered:
-            return
+    def add_partition_switch(*partition_ids: str) -> None:
+        for partition_id in partition_ids:
+            if partition_id in registered:
+                continue
 
-        switch_entity = AlarmPartitionArmButton(coordinator, partition_id, api)
-        switch_night_entity = AlarmPartitionArmNightButton(
-            coordinator, partition_id, api
-        )
-        registered[partition_id] = [switch_entity, switch_night_entity]
+            switch_entity = AlarmPartitionArmButton(coordinator, partition_id, api)
+            switch_night_entity = AlarmPartitionArmNightButton(
+                coordinator, partition_id, api
+            )
+            registered[partition_id] = [switch_entity, switch_night_entity]
         # async_add_entities([switch_entity, switch_night_entity])  # noqa: ERA001
 
     return add_partition_switch
@@ -69,13 +75,12 @@ async def async_setup_entry(
     api: IntegrationPulsonAlarmApiClient = coordinator.api_client
 
     add_block_switch = create_input_switch_adder(coordinator, api, async_add_entities)
-    api.input_register_added_callback(add_block_switch)
+    discovery = entry.runtime_data.discovery
+    api.input_register_added_callback(discovery.wrap(add_block_switch))
     add_partition_switch = create_partition_switch_adder(
         coordinator, api, async_add_entities
     )
-    api.partition_register_added_callback(add_partition_switch)
+    api.partition_register_added_callback(discovery.wrap(add_partition_switch))
 
-    for input_id in api.input_get_all_ids():
-        add_block_switch(input_id)
-    for partition_id in api.partition_get_all_ids():
-        add_partition_switch(partition_id)
+    add_block_switch(*api.input_get_all_ids())
+    add_partition_switch(*api.partition_get_all_ids())
@@ -0,0 +1,60 @@
+"""Creation and caching of SSL contexts used by MQTT connections."""
+
+from __future__ import annotations
+
+import asyncio
+import ssl
+import time
+from typing import Any
+
+_SSLContextKey = tuple[str | None, str | None, str | None]
+
+_CONTEXTS: dict[_SSLContextKey, ssl.SSLContext] = {}
+_LOAD_TIMES: dict[_SSLContextKey, float] = {}
+
+
+def _create_ssl_context(
+    ca_certs: str | None, certfile: str | None, keyfile: str | None
+) -> tuple[ssl.SSLContext, float]:
+    """Load CA bundle and optional client certificate, measuring the time."""
+    start = time.perf_counter()
+    context = ssl.create_default_context(cafile=ca_certs)
+    if certfile:
+        context.load_cert_chain(certfile, keyfile)
+    return context, time.perf_counter() - start
+
+
+async def async_get_ssl_context(
+    ca_certs: str | None = None,
+    certfile: str | None = None,
+    keyfile: str | None = None,
+) -> ssl.SSLContext:
+    """
+    Return SSL context for the given certificates.
+
+    Contexts are created once per process in an executor, because loading the
+    CA bundle from disk would block the event loop.
+    """
+    key = (ca_certs or None, certfile or None, keyfile or None)
+    context = _CONTEXTS.get(key)
+    if context is None:
+        context, load_time = await asyncio.get_running_loop().run_in_executor(
+            None, _create_ssl_context, *key
+        )
+        if key not in _CONTEXTS:
+            _CONTEXTS[key] = context
+            _LOAD_TIMES[key] = load_time
+        context = _CONTEXTS[key]
+    return context
+
+
+def ssl_context_stats() -> dict[str, Any]:
+    """Return number of cached contexts and how long each took to load."""
+    return {
+        "contexts": len(_CONTEXTS),
+        "load_times": [
+            {"custom_ca": key[0] is not None, "client_cert": key[1] is not None}
+            | {"seconds": round(load_time, 4)}
+            for key, load_time in _LOAD_TIMES.items()
+        ],
+    }
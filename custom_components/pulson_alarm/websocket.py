@@ -0,0 +1,78 @@
+"""Websocket API of the integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, TOPIC_MODULE_INPUTS, TOPIC_MODULE_PARTITIONS
+
+if TYPE_CHECKING:
+    from homeassistant.components.websocket_api import ActiveConnection
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands of the integration."""
+    websocket_api.async_register_command(hass, websocket_history)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Optional("config_entry_id"): cv.string,
+        vol.Optional("module"): vol.In([TOPIC_MODULE_INPUTS, TOPIC_MODULE_PARTITIONS]),
+        vol.Optional("object_id"): cv.string,
+        vol.Optional("start_time"): cv.datetime,
+        vol.Optional("end_time"): cv.datetime,
+        vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+@callback
+def websocket_history(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """
+    Return recent changes of inputs and partitions of a panel.
+
+    Events are lists of timestamp, module, object id, key, old and new value, in
+    chronological order.
+    """
+    entries = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+    entry_id = msg.get("config_entry_id")
+    if entry_id is not None:
+        entries = [entry for entry in entries if entry.entry_id == entry_id]
+    if len(entries) != 1:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"No loaded panel with config entry {entry_id}"
+            if entry_id is not None
+            else "Several panels are loaded, set config_entry_id",
+        )
+        return
+    history = entries[0].runtime_data.api_client.history
+    start = msg.get("start_time")
+    end = msg.get("end_time")
+    connection.send_result(
+        msg["id"],
+        {
+            "events": history.query(
+                msg.get("module"),
+                msg.get("object_id"),
+                None if start is None else dt_util.as_timestamp(start),
+                None if end is None else dt_util.as_timestamp(end),
+                msg.get("limit"),
+            )
+        },
+    )